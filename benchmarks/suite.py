@@ -0,0 +1,180 @@
+"""
+    Suite de rendimiento reproducible para los optimizadores 1D, 2D y 3D:
+
+        python -m benchmarks.suite --salida rendimiento.json --escalas 1 2 --trabajadores 1 4
+
+    Cada caso (dimensión, motor de colocación, escala de los contenedores,
+    trabajadores y semilla) se ejecuta en un intérprete nuevo para que la
+    memoria máxima de uno no contamine la del siguiente. Por caso se mide:
+    evaluaciones por segundo, colocaciones de contenedor por segundo (solo
+    en serie), segundos hasta alcanzar la aptitud objetivo, memoria máxima
+    del proceso principal y utilización final
+"""
+import argparse
+import io
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import closing, redirect_stdout
+
+import numpy as np
+
+from modelo.datos import RequisitosContenedor, Paquete
+from modelo.trabajos import OPTIMIZADORES
+
+# Instancias fijas: contenedores base (se escalan) y paquetes (dimensiones y cantidad máxima base)
+INSTANCIAS = {
+    1: {
+        'contenedores': [((60,), False), ((45,), False), ((30,), True)],
+        'paquetes': [((3,), 8), ((5,), 6), ((7,), 5), ((11,), 4), ((13,), 3)],
+    },
+    2: {
+        'contenedores': [((12, 10), False), ((10, 8), True)],
+        'paquetes': [((2, 3), 8), ((4, 2), 6), ((3, 5), 4), ((1, 6), 4)],
+    },
+    3: {
+        'contenedores': [((8, 8, 8), False), ((6, 6, 6), True)],
+        'paquetes': [((2, 2, 3), 10), ((3, 3, 3), 6), ((4, 2, 2), 6), ((1, 5, 2), 4)],
+    },
+}
+
+MOTORES = {
+    1: ('intervalos_libres', 'rejilla'),
+    2: ('rejilla', 'rectangulos_maximos', 'ocupacion_numpy'),
+    3: ('rejilla', 'puntos_extremos', 'ocupacion_numpy'),
+}
+
+
+def crear_instancia(ejes: int, escala: int) -> tuple[list, list, list]:
+    """Contenedores con cada lado multiplicado por escala y cantidades máximas por escala ** ejes"""
+    instancia = INSTANCIAS[ejes]
+    contenedores = [
+        RequisitosContenedor(tuple(d * escala for d in dimensiones), f"C{i + 1}", opcional)
+        for i, (dimensiones, opcional) in enumerate(instancia['contenedores'])
+    ]
+    paquetes = [
+        Paquete(f"P{j + 1}", dimensiones, 1, maximo * escala ** ejes)
+        for j, (dimensiones, maximo) in enumerate(instancia['paquetes'])
+    ]
+    rotaciones = [(True,) * 5 for _ in paquetes] if ejes > 1 else []
+    return contenedores, paquetes, rotaciones
+
+
+def crear_optimizador(caso: dict):
+    contenedores, paquetes, rotaciones = crear_instancia(caso['ejes'], caso['escala'])
+    return OPTIMIZADORES[caso['ejes']](
+        requisitos_contenedores=contenedores,
+        tipos_paquetes=paquetes,
+        rotaciones_permitidas=rotaciones,
+        tamano_poblacion=caso['poblacion'],
+        generaciones=caso['generaciones'],
+        trabajadores=caso['trabajadores'],
+        motor_colocacion=caso['motor']
+    )
+
+
+def ejecutar_caso(caso: dict) -> dict:
+    """Ejecuta un caso y devuelve sus métricas; corre dentro de un proceso nuevo"""
+    optimizador = crear_optimizador(caso)
+
+    # En serie se cuentan las colocaciones reales (las que no resolvió la caché)
+    colocaciones = [0]
+    if caso['trabajadores'] == 1:
+        colocar = optimizador._colocar_paquetes_en_contenedor
+
+        def contar_colocacion(*argumentos):
+            colocaciones[0] += 1
+            return colocar(*argumentos)
+        optimizador._colocar_paquetes_en_contenedor = contar_colocacion
+
+    registro = None
+    evaluaciones = 0
+    segundos_evaluacion = 0.0
+    segundos_objetivo = None
+    inicio = time.perf_counter()
+    with redirect_stdout(io.StringIO()), closing(optimizador.iterar_generaciones(caso['semilla'])) as generaciones:
+        for registro in generaciones:
+            evaluaciones += registro['evaluaciones']
+            segundos_evaluacion += registro['tiempos']['evaluacion']
+            if segundos_objetivo is None and registro['mejor_aptitud'] >= caso['objetivo']:
+                segundos_objetivo = time.perf_counter() - inicio
+    segundos = time.perf_counter() - inicio
+    resultado = optimizador.resultado_desde_registro(registro)
+    analisis = optimizador.analizar_resultados(resultado)
+
+    return {
+        **caso,
+        'clase': type(optimizador).__name__,
+        'generaciones_ejecutadas': registro['gen'] + 1,
+        'segundos': segundos,
+        'evaluaciones': evaluaciones,
+        'evaluaciones_por_segundo': evaluaciones / max(segundos_evaluacion, 1e-9),
+        'colocaciones_por_segundo': (colocaciones[0] / max(segundos_evaluacion, 1e-9)
+                                     if caso['trabajadores'] == 1 else None),
+        'segundos_hasta_objetivo': segundos_objetivo,
+        # ru_maxrss está en KiB en Linux y en bytes en macOS
+        'memoria_maxima_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (
+            1024 ** 2 if sys.platform == 'darwin' else 1024),
+        'aptitud': resultado['aptitud'],
+        'utilizacion': float(analisis['metricas_globales']['porcentaje_utilizacion_global']),
+    }
+
+
+def casos(args) -> list[dict]:
+    return [
+        {'ejes': ejes, 'motor': motor, 'escala': escala, 'trabajadores': trabajadores, 'semilla': semilla,
+         'poblacion': args.poblacion, 'generaciones': args.generaciones, 'objetivo': args.objetivo}
+        for ejes in args.dimensiones
+        for motor in MOTORES[ejes]
+        for escala in args.escalas
+        for trabajadores in args.trabajadores
+        for semilla in args.semillas
+    ]
+
+
+def entorno() -> dict:
+    import deap
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'deap': deap.__version__,
+        'plataforma': platform.platform(),
+        'procesadores': os.cpu_count(),
+    }
+
+
+def main(argumentos: list[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="Suite de rendimiento de los optimizadores de empaquetado")
+    parser.add_argument('--salida', default='rendimiento.json')
+    parser.add_argument('--dimensiones', type=int, nargs='+', default=[1, 2, 3], choices=[1, 2, 3])
+    parser.add_argument('--escalas', type=int, nargs='+', default=[1],
+                        help="Factores de los lados de los contenedores; la rejilla 3D ya es muy lenta con 2")
+    parser.add_argument('--trabajadores', type=int, nargs='+', default=[1])
+    parser.add_argument('--semillas', type=int, nargs='+', default=[1, 2, 3])
+    parser.add_argument('--poblacion', type=int, default=100)
+    parser.add_argument('--generaciones', type=int, default=15)
+    parser.add_argument('--objetivo', type=float, default=0.8, help="Aptitud para medir el tiempo hasta alcanzarla")
+    args = parser.parse_args(argumentos)
+
+    # spawn: cada caso parte de un intérprete limpio y su memoria máxima es solo suya
+    contexto = multiprocessing.get_context('spawn')
+    resultados = []
+    for caso in casos(args):
+        with ProcessPoolExecutor(max_workers=1, mp_context=contexto) as ejecutor:
+            resultados.append(ejecutor.submit(ejecutar_caso, caso).result())
+        r = resultados[-1]
+        print(f"{r['clase']:<42}{r['motor']:<20}escala {r['escala']}  trabajadores {r['trabajadores']}  "
+              f"semilla {r['semilla']}: {r['evaluaciones_por_segundo']:.0f} eval/s, aptitud {r['aptitud']:.4f}")
+
+    with open(args.salida, 'w', encoding='utf-8') as archivo:
+        json.dump({'entorno': entorno(), 'parametros': vars(args), 'casos': resultados}, archivo,
+                  ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
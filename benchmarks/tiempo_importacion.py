@@ -0,0 +1,58 @@
+"""
+    Tiempo de importación de los optimizadores medido en procesos nuevos,
+    como lo paga cada trabajador al arrancar:
+
+        python -m benchmarks.tiempo_importacion --repeticiones 10
+
+    La columna "con gráficas" importa además matplotlib, que es lo que
+    costaba importar el optimizador cuando las gráficas se cargaban al inicio
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+
+MODULOS = ('modelo.bpga_1d', 'modelo.bpga_2d', 'modelo.bpga_3d')
+
+CODIGO = """
+import sys, time
+inicio = time.perf_counter()
+import {modulos}
+fin = time.perf_counter()
+cargados = [m for m in ('matplotlib', 'PyQt5') if m in sys.modules]
+print(fin - inicio, ','.join(cargados))
+"""
+
+
+def medir_importacion(modulos: list[str], repeticiones: int) -> tuple[list[float], str]:
+    """Segundos de cada importación en un intérprete nuevo y los paquetes gráficos que quedaron cargados"""
+    tiempos = []
+    cargados = ''
+    for _ in range(repeticiones):
+        salida = subprocess.run(
+            [sys.executable, '-c', CODIGO.format(modulos=', '.join(modulos))],
+            cwd=RAIZ, capture_output=True, text=True, check=True
+        ).stdout.split()
+        tiempos.append(float(salida[0]))
+        cargados = salida[1] if len(salida) > 1 else ''
+    return tiempos, cargados
+
+
+def main(argumentos: list[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="Mide el tiempo de importación de los optimizadores")
+    parser.add_argument('--repeticiones', type=int, default=10)
+    args = parser.parse_args(argumentos)
+
+    print(f"{'módulo':<18}{'solo optimizador':>18}{'con gráficas':>15}  cargados")
+    for modulo in MODULOS:
+        solo, cargados = medir_importacion([modulo], args.repeticiones)
+        con_graficas, _ = medir_importacion([modulo, 'matplotlib.pyplot'], args.repeticiones)
+        print(f"{modulo:<18}{statistics.median(solo) * 1000:>15.1f} ms"
+              f"{statistics.median(con_graficas) * 1000:>12.1f} ms  {cargados or '-'}")
+
+
+if __name__ == "__main__":
+    main()
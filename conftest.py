@@ -0,0 +1,8 @@
+"""
+    Configuración de pytest: la raíz del repositorio va en sys.path para
+    que las pruebas importen modelo/ también al ejecutar solo `pytest`
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -3,16 +3,27 @@ from PyQt5.QtWidgets import QApplication
 from vista.vista_principal import BPGAVista
 from modelo.modelo_principal import Modelo
 from modelo.datos import RequisitosContenedor, Paquete
+from control.trabajador import TrabajadorOptimizacion
 
 class Control:
     def __init__(self):
         self._modelo : Modelo = None
         self._app = QApplication(sys.argv)
         self._vista : BPGAVista = None
+        self._trabajador : TrabajadorOptimizacion = None
+        self._ultimo_trabajo = 0
+        self._trabajos_pendientes = set()
 
     def set_mvc(self,modelo: Modelo,vista: BPGAVista):
         self._modelo = modelo
         self._vista = vista
+        # La optimización corre en otro hilo; las señales llegan al hilo de la interfaz
+        self._trabajador = TrabajadorOptimizacion(modelo)
+        self._trabajador.progreso.connect(self.progreso)
+        self._trabajador.terminado.connect(self.terminado)
+        self._trabajador.fallo.connect(self.fallo)
+        # detener se llama desde el hilo de la interfaz: el trabajador vive en su propio hilo
+        self._app.aboutToQuit.connect(lambda: self._trabajador.detener())
 
     def inciar(self):
         self._vista.show()
@@ -27,7 +38,27 @@ class Control:
         print(paquetes)
         print(rotaciones)
         print("Solicitud recibida")
-        self._modelo.optimizar(contenedores,paquetes,rotaciones,poblacion,generaciones)
+        self._ultimo_trabajo += 1
+        self._trabajos_pendientes.add(self._ultimo_trabajo)
+        self._vista.trabajo_encolado(self._ultimo_trabajo, generaciones, len(self._trabajos_pendientes))
+        self._trabajador.encolar(self._ultimo_trabajo, (contenedores, paquetes, rotaciones, poblacion, generaciones))
+
+    def progreso(self, id_trabajo: int, registro: dict):
+        self._vista.mostrar_progreso(id_trabajo, registro, len(self._trabajos_pendientes))
+
+    def terminado(self, id_trabajo: int, optimizador, resultado: dict):
+        if resultado['individuo'] is None:
+            # Ningún individuo superó aptitud 0 (nada cabe o se detuvo antes): no hay nada que analizar ni graficar
+            self.fallo(id_trabajo, "no se encontró ninguna solución con paquetes colocados")
+            return
+        self._trabajos_pendientes.discard(id_trabajo)
+        self._vista.trabajo_terminado(id_trabajo, resultado['aptitud'], len(self._trabajos_pendientes))
+        self._modelo.mostrar_resultados(optimizador, resultado)
+        self.listo()
+
+    def fallo(self, id_trabajo: int, mensaje: str):
+        self._trabajos_pendientes.discard(id_trabajo)
+        self._vista.trabajo_fallido(id_trabajo, mensaje, len(self._trabajos_pendientes))
 
     def listo(self):
         print("Listo")
@@ -0,0 +1,54 @@
+import threading
+
+from PyQt5.QtCore import QObject, QThread, pyqtSignal, pyqtSlot
+
+
+class TrabajadorOptimizacion(QObject):
+    """
+    Ejecuta las optimizaciones en un hilo propio para no bloquear la interfaz.
+    Las solicitudes se encolan en el bucle de eventos del hilo y se atienden una
+    tras otra; el avance y el resultado vuelven a la interfaz mediante señales
+    """
+    solicitud = pyqtSignal(int, object)
+    progreso = pyqtSignal(int, object)
+    terminado = pyqtSignal(int, object, object)
+    fallo = pyqtSignal(int, str)
+
+    def __init__(self, modelo):
+        super().__init__()
+        self._modelo = modelo
+        # Al cerrar la aplicación detiene el trabajo en curso y descarta los que esperan
+        self._detener = threading.Event()
+        self._hilo = QThread()
+        self.moveToThread(self._hilo)
+        # El receptor vive en el hilo de trabajo: la conexión queda en cola
+        self.solicitud.connect(self._ejecutar)
+        self._hilo.start()
+
+    def encolar(self, id_trabajo: int, argumentos: tuple):
+        self.solicitud.emit(id_trabajo, argumentos)
+
+    @pyqtSlot(int, object)
+    def _ejecutar(self, id_trabajo: int, argumentos: tuple):
+        if self._detener.is_set():
+            return
+        try:
+            optimizador, resultado = self._modelo.optimizar(
+                *argumentos,
+                progreso=lambda registro: self._avisar(id_trabajo, registro)
+            )
+        except Exception as error:
+            self.fallo.emit(id_trabajo, f"{type(error).__name__}: {error}")
+        else:
+            self.terminado.emit(id_trabajo, optimizador, resultado)
+
+    def _avisar(self, id_trabajo: int, registro: dict) -> bool:
+        """Envía el avance a la interfaz; devolver True hace que optimizar se detenga en esta generación"""
+        self.progreso.emit(id_trabajo, registro)
+        return self._detener.is_set()
+
+    def detener(self):
+        """Termina el hilo al cerrar la aplicación: el trabajo en curso para al acabar su generación"""
+        self._detener.set()
+        self._hilo.quit()
+        self._hilo.wait()
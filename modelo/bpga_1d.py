@@ -1,9 +1,10 @@
 from modelo.bpga_core import OptimizadorEmpaquetadoMultiContenedor
 from modelo.datos import Paquete, RequisitosContenedor
+from modelo.intervalos_libres import IntervalosLibres
 import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
-plt.switch_backend('Qt5Agg')
+
+# 'intervalos_libres' busca en los huecos ordenados, 'rejilla' recorre cada x (modo de referencia)
+MOTORES_COLOCACION_1D = ('intervalos_libres', 'rejilla')
 
 class OptimizadorEmpaquetadoMultiContenedor1D(OptimizadorEmpaquetadoMultiContenedor):
 
@@ -13,10 +14,29 @@ class OptimizadorEmpaquetadoMultiContenedor1D(OptimizadorEmpaquetadoMultiContene
                  tamano_poblacion: int = 1000,
                  generaciones: int = 55,
                  prob_cruce: float = 0.618,
-                 prob_mutacion: float = 0.021) -> None:
+                 prob_mutacion: float = 0.021,
+                 tamano_cache_aptitud: int = 10000,
+                 tamano_cache_colocacion: int = 20000,
+                 max_paquetes_cache_colocacion: int = 2000000,
+                 colocacion_incremental: bool = False,
+                 max_nodos_prefijos: int = 100000,
+                 max_bytes_prefijos: int = 256 * 2 ** 20,
+                 trabajadores: int = 1,
+                 tamano_lote_trabajadores: int = None,
+                 representacion_compacta: bool = False,
+                 instrumentacion: bool = False,
+                 motor_colocacion: str = 'intervalos_libres',
+                 evaluacion_vectorizada: bool = False) -> None:
 
+        if motor_colocacion not in MOTORES_COLOCACION_1D:
+            raise ValueError(f"Motor de colocación desconocido: {motor_colocacion}")
+        self.motor_colocacion = motor_colocacion
+        # Evaluar cada generación completa como una matriz de NumPy en lugar de colocar paquete por paquete
+        self.evaluacion_vectorizada = evaluacion_vectorizada
         super().__init__(requisitos_contenedores, tipos_paquetes, rotaciones_permitidas, tamano_poblacion, generaciones,
-                         prob_cruce, prob_mutacion)
+                         prob_cruce, prob_mutacion, tamano_cache_aptitud, tamano_cache_colocacion,
+                         max_paquetes_cache_colocacion, colocacion_incremental, max_nodos_prefijos, max_bytes_prefijos,
+                         trabajadores, tamano_lote_trabajadores, representacion_compacta, instrumentacion)
 
     def _generar_rotaciones_paquete(self, paquete: Paquete, indice: int) -> list[tuple]:
         """Generar todas las posibles rotaciones de un paquete"""
@@ -25,6 +45,15 @@ class OptimizadorEmpaquetadoMultiContenedor1D(OptimizadorEmpaquetadoMultiContene
         rotaciones_tipo = [(x, nombre), ]
         return rotaciones_tipo
 
+    def _dimensiones_rotacion(self, rotacion: tuple) -> tuple:
+        return rotacion[:1]
+
+    def _nombre_rotacion(self, rotacion: tuple) -> str:
+        return rotacion[1]
+
+    def _rotacion_con_indice(self, rotacion: tuple, id_rotacion: int) -> tuple:
+        return (rotacion[0], id_rotacion)
+
     def _puede_colocar_paquete(self, paquetes_existentes, nuevo_paquete, posicion, dimensiones_contenedor) -> bool:
         """Determinar si un nuevo paquete puede ser colocado en una posición dada"""
         x = posicion[0]
@@ -40,23 +69,84 @@ class OptimizadorEmpaquetadoMultiContenedor1D(OptimizadorEmpaquetadoMultiContene
 
         return True
 
-    def _first_fit(self, colocado, dimensiones_contenedor, paquetes_colocados, paso_rejilla, rotaciones):
+    def _crear_estado_contenedor(self, dimensiones_contenedor):
+        if self.motor_colocacion == 'intervalos_libres':
+            return IntervalosLibres(dimensiones_contenedor)
+        return None
+
+    def _first_fit(self, colocado, dimensiones_contenedor, paquetes_colocados, paso_rejilla, rotaciones, estado=None):
+        if self.motor_colocacion == 'intervalos_libres':
+            return self._first_fit_intervalos(colocado, paquetes_colocados, rotaciones, estado)
+
         for rotacion in rotaciones:
-            l_rot, nombre_rot = rotacion
+            l_rot, id_rot = rotacion
             for x in range(0, dimensiones_contenedor[0] - l_rot + 1, paso_rejilla):
                 if self._puede_colocar_paquete(paquetes_colocados, (l_rot,), (x,), dimensiones_contenedor):
-                    paquetes_colocados.append((x, l_rot, nombre_rot))
+                    paquetes_colocados.append((x, l_rot, id_rot))
                     colocado = True
                     break
             if colocado:
                 break
         return colocado
 
+    def _first_fit_intervalos(self, colocado, paquetes_colocados, rotaciones, libres: IntervalosLibres):
+        """Coloca el paquete en el primer intervalo libre donde cabe"""
+        for rotacion in rotaciones:
+            l_rot, id_rot = rotacion
+            x = libres.buscar_posicion(l_rot)
+            if x is not None:
+                paquetes_colocados.append((x, l_rot, id_rot))
+                libres.ocupar(x, l_rot)
+                colocado = True
+                break
+        return colocado
+
+    def _evaluar_poblacion(self, individuos) -> list[tuple[float]]:
+        if not self.evaluacion_vectorizada:
+            return super()._evaluar_poblacion(individuos)
+        return [(aptitud,) for aptitud in self.evaluar_poblacion_vectorizada(individuos)]
+
+    def evaluar_poblacion_vectorizada(self, individuos) -> np.ndarray:
+        """
+        Calcula la misma aptitud que _evaluar_aptitud para toda la población a la vez.
+        En 1D los paquetes quedan contiguos, así que de cada tipo caben
+        min(cantidad, espacio restante // longitud) y el espacio ocupado se acumula tipo a tipo
+        """
+        genes = np.asarray(individuos, dtype=np.int64).reshape(
+            len(individuos), self.num_contenedores, 1 + self.num_tipos_paquetes)
+        usar = genes[:, :, 0] == 1
+        cantidades = np.where(usar[:, :, None], genes[:, :, 1:], 0)
+        longitudes_contenedores = np.array([req.dimensiones[0] for req in self.requisitos_contenedores],
+                                           dtype=np.int64)
+
+        # Colocar los tipos en el orden de los genes, igual que _colocar_paquetes_en_contenedor
+        ocupado = np.zeros(usar.shape, dtype=np.int64)
+        colocados = np.zeros_like(cantidades)
+        for j in range(self.num_tipos_paquetes):
+            longitud = self.rotaciones_precalculadas[j][0][0]
+            colocados[:, :, j] = np.minimum(cantidades[:, :, j], (longitudes_contenedores - ocupado) // longitud)
+            ocupado += colocados[:, :, j] * longitud
+
+        volumen_total_utilizado = ocupado.sum(axis=1)
+        volumen_total_contenedores = (usar * longitudes_contenedores).sum(axis=1)
+        cantidad_total = colocados.sum(axis=1)
+
+        # Penalizar en el mismo orden que _evaluar_aptitud para obtener los mismos flotantes
+        penalizacion = np.ones(len(individuos))
+        for j, tipo_paquete in enumerate(self.tipos_paquetes):
+            penalizacion = np.where(cantidad_total[:, j] < tipo_paquete.cantidad_minima, penalizacion * 0.6,
+                                    penalizacion)
+            penalizacion = np.where(cantidad_total[:, j] > tipo_paquete.cantidad_maxima, penalizacion * 0.6,
+                                    penalizacion)
+
+        hay_contenedores = volumen_total_contenedores > 0
+        aptitud = np.zeros(len(individuos))
+        aptitud[hay_contenedores] = (volumen_total_utilizado[hay_contenedores] /
+                                     volumen_total_contenedores[hay_contenedores]) * penalizacion[hay_contenedores]
+        return aptitud
+
     def _conteo_paquetes(self, cantidad_total, dimensiones_contenedor, paquetes_colocados):
-        for paq in paquetes_colocados:
-            # Extraer el nombre original del paquete sin la rotación
-            nombre_original = paq[2].split('_')[0]
-            cantidad_total[nombre_original] += 1
+        self._contar_tipos(cantidad_total, paquetes_colocados)
         # Calcular volúmenes
         volumen_contenedor = np.prod(dimensiones_contenedor)
         volumen_utilizado = sum(paq[1] for paq in paquetes_colocados)
@@ -65,7 +155,8 @@ class OptimizadorEmpaquetadoMultiContenedor1D(OptimizadorEmpaquetadoMultiContene
     def _contenedor_info(self, contenedor_info, paquetes_colocados):
         contenedor_info['paquetes'] = [
             {
-                'tipo': paq[2],
+                'tipo': self.nombres_rotacion[paq[2]],
+                'id_tipo': int(self.tipo_rotacion[paq[2]]),
                 'posicion': (paq[0],),
                 'dimensiones': (paq[1],)
             } for paq in paquetes_colocados
@@ -76,6 +167,9 @@ class OptimizadorEmpaquetadoMultiContenedor1D(OptimizadorEmpaquetadoMultiContene
         Grafica los resultados del empaquetado usando matplotlib con navegación entre contenedores.
         Muestra una visualización de cómo están distribuidos los paquetes en cada contenedor.
         """
+        import matplotlib.pyplot as plt
+        import matplotlib.patches as patches
+
         # Obtener contenedores en uso
         contenedores_activos = [c for c in resultado['posiciones']['contenedores'] if c['en_uso']]
         num_contenedores = len(contenedores_activos)
@@ -115,7 +209,7 @@ class OptimizadorEmpaquetadoMultiContenedor1D(OptimizadorEmpaquetadoMultiContene
             for paquete in contenedor['paquetes']:
                 x = paquete['posicion'][0]
                 longitud = paquete['dimensiones'][0]
-                tipo_base = paquete['tipo'].split('_')[0]  # Obtener tipo base sin rotación
+                tipo_base = self.tipos_paquetes[paquete['id_tipo']].nombre
 
                 # Crear y añadir el rectángulo del paquete
                 paquete_rect = patches.Rectangle(
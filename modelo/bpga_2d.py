@@ -1,8 +1,13 @@
 from modelo.datos import RequisitosContenedor, Paquete
 import numpy as np
 from modelo.bpga_core import OptimizadorEmpaquetadoMultiContenedor
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
+from modelo.rejilla_ocupacion import RejillaOcupacion
+from modelo.indice_espacial import IndiceEspacial
+from modelo.rectangulos_libres import RectangulosLibres
+
+# 'rejilla' recorre todas las celdas (modo de referencia), 'rectangulos_maximos' solo los rectángulos libres,
+# 'ocupacion_numpy' evalúa bloques de celdas a la vez sobre una rejilla de huecos libres
+MOTORES_COLOCACION_2D = ('rejilla', 'rectangulos_maximos', 'ocupacion_numpy')
 
 
 class OptimizadorEmpaquetadoMultiContenedor2D(OptimizadorEmpaquetadoMultiContenedor):
@@ -13,10 +18,28 @@ class OptimizadorEmpaquetadoMultiContenedor2D(OptimizadorEmpaquetadoMultiContene
                  tamano_poblacion: int = 1000,
                  generaciones: int = 55,
                  prob_cruce: float = 0.618,
-                 prob_mutacion: float = 0.021) -> None:
-
+                 prob_mutacion: float = 0.021,
+                 tamano_cache_aptitud: int = 10000,
+                 tamano_cache_colocacion: int = 20000,
+                 max_paquetes_cache_colocacion: int = 2000000,
+                 colocacion_incremental: bool = False,
+                 max_nodos_prefijos: int = 100000,
+                 max_bytes_prefijos: int = 256 * 2 ** 20,
+                 trabajadores: int = 1,
+                 tamano_lote_trabajadores: int = None,
+                 representacion_compacta: bool = False,
+                 instrumentacion: bool = False,
+                 motor_colocacion: str = 'rejilla',
+                 indice_espacial: bool = False) -> None:
+
+        if motor_colocacion not in MOTORES_COLOCACION_2D:
+            raise ValueError(f"Motor de colocación desconocido: {motor_colocacion}")
+        self.motor_colocacion = motor_colocacion
+        self.indice_espacial = indice_espacial
         super().__init__(requisitos_contenedores, tipos_paquetes, rotaciones_permitidas, tamano_poblacion, generaciones,
-                         prob_cruce, prob_mutacion)
+                         prob_cruce, prob_mutacion, tamano_cache_aptitud, tamano_cache_colocacion,
+                         max_paquetes_cache_colocacion, colocacion_incremental, max_nodos_prefijos, max_bytes_prefijos,
+                         trabajadores, tamano_lote_trabajadores, representacion_compacta, instrumentacion)
 
     def _generar_rotaciones_paquete(self, paquete: Paquete, indice : int) -> list[tuple]:
         """Genera todas las rotaciones únicas permitidas para un paquete"""
@@ -30,16 +53,30 @@ class OptimizadorEmpaquetadoMultiContenedor2D(OptimizadorEmpaquetadoMultiContene
 
         return rotaciones_tipo
 
-    def _first_fit(self, colocado, dimensiones_contenedor, paquetes_colocados, paso_rejilla, rotaciones):
+    def _crear_estado_contenedor(self, dimensiones_contenedor):
+        if self.motor_colocacion == 'rectangulos_maximos':
+            return RectangulosLibres(dimensiones_contenedor)
+        if self.motor_colocacion == 'ocupacion_numpy':
+            return RejillaOcupacion(dimensiones_contenedor)
+        return self._crear_indice_espacial()
+
+    def _first_fit(self, colocado, dimensiones_contenedor, paquetes_colocados, paso_rejilla, rotaciones, estado=None):
+        if self.motor_colocacion == 'rectangulos_maximos':
+            return self._first_fit_rectangulos(colocado, paquetes_colocados, rotaciones, estado)
+        if self.motor_colocacion == 'ocupacion_numpy':
+            return self._first_fit_ocupacion(colocado, paquetes_colocados, paso_rejilla, rotaciones, estado)
+
         for rotacion in rotaciones:
-            nombre_rot, l_rot, a_rot = rotacion
+            id_rot, l_rot, a_rot = rotacion
             for x in range(0, dimensiones_contenedor[0] - l_rot + 1, paso_rejilla):
                 for y in range(0, dimensiones_contenedor[1] - a_rot + 1, paso_rejilla):
                     if self._puede_colocar_paquete(paquetes_colocados, (l_rot, a_rot), (x, y),
-                                                   dimensiones_contenedor):
+                                                   dimensiones_contenedor, estado):
                         paquetes_colocados.append(
-                            (x, y, l_rot, a_rot, nombre_rot)
+                            (x, y, l_rot, a_rot, id_rot)
                         )
+                        if estado is not None:
+                            estado.agregar(paquetes_colocados[-1])
                         colocado = True
                         break
                 if colocado:
@@ -48,7 +85,23 @@ class OptimizadorEmpaquetadoMultiContenedor2D(OptimizadorEmpaquetadoMultiContene
                 break
         return colocado
 
-    def _puede_colocar_paquete(self, paquetes_existentes, nuevo_paquete, posicion, dimensiones_contenedor) -> bool:
+    def _first_fit_rectangulos(self, colocado, paquetes_colocados, rotaciones, libres: RectangulosLibres):
+        """Busca la posición inferior izquierda entre los rectángulos libres maximales"""
+        for rotacion in rotaciones:
+            id_rot, l_rot, a_rot = rotacion
+            posicion = libres.buscar_posicion(l_rot, a_rot)
+            if posicion is not None:
+                x, y = posicion
+                paquetes_colocados.append(
+                    (x, y, l_rot, a_rot, id_rot)
+                )
+                libres.ocupar(x, y, l_rot, a_rot)
+                colocado = True
+                break
+        return colocado
+
+    def _puede_colocar_paquete(self, paquetes_existentes, nuevo_paquete, posicion, dimensiones_contenedor,
+                               indice: IndiceEspacial = None) -> bool:
         """Verifica si un paquete puede ser colocado en la posición dada"""
         x, y = posicion
         l, a = nuevo_paquete
@@ -57,6 +110,10 @@ class OptimizadorEmpaquetadoMultiContenedor2D(OptimizadorEmpaquetadoMultiContene
                 y + a > dimensiones_contenedor[1]):
             return False
 
+        # Con índice espacial solo se revisan los paquetes de las celdas cercanas
+        if indice is not None:
+            paquetes_existentes = indice.cercanos(posicion, (l, a))
+
         for paq in paquetes_existentes:
             px, py, pl, pa, _ = paq
             if not (x + l <= px or px + pl <= x or
@@ -65,10 +122,7 @@ class OptimizadorEmpaquetadoMultiContenedor2D(OptimizadorEmpaquetadoMultiContene
         return True
 
     def _conteo_paquetes(self, cantidad_total, dimensiones_contenedor, paquetes_colocados):
-        for paq in paquetes_colocados:
-            # Extraer el nombre original del paquete sin la rotación
-            nombre_original = paq[4].split('_')[0]
-            cantidad_total[nombre_original] += 1
+        self._contar_tipos(cantidad_total, paquetes_colocados)
         # Calcular volúmenes
         volumen_contenedor = np.prod(dimensiones_contenedor)
         volumen_utilizado = sum(paq[2] * paq[3] for paq in paquetes_colocados)
@@ -77,7 +131,8 @@ class OptimizadorEmpaquetadoMultiContenedor2D(OptimizadorEmpaquetadoMultiContene
     def _contenedor_info(self, contenedor_info, paquetes_colocados):
         contenedor_info['paquetes'] = [
             {
-                'tipo': paq[4],
+                'tipo': self.nombres_rotacion[paq[4]],
+                'id_tipo': int(self.tipo_rotacion[paq[4]]),
                 'posicion': (paq[0], paq[1]),
                 'dimensiones': (paq[2], paq[3])
             } for paq in paquetes_colocados
@@ -92,6 +147,9 @@ class OptimizadorEmpaquetadoMultiContenedor2D(OptimizadorEmpaquetadoMultiContene
         Args:
             resultado (dict): Diccionario con los resultados de la optimización
         """
+        import matplotlib.pyplot as plt
+        import matplotlib.patches as patches
+
         # Filtrar contenedores en uso
         contenedores_activos = [c for c in resultado['posiciones']['contenedores'] if c['en_uso'] and c['paquetes']]
         num_contenedores = len(contenedores_activos)
@@ -102,7 +160,7 @@ class OptimizadorEmpaquetadoMultiContenedor2D(OptimizadorEmpaquetadoMultiContene
 
         # Crear un mapa de colores para cada tipo de paquete
         tipos_unicos = {paquete.nombre for paquete in self.tipos_paquetes}
-        colores = plt.cm.get_cmap('tab20')(np.linspace(0, 1, len(tipos_unicos)))
+        colores = plt.get_cmap('tab20')(np.linspace(0, 1, len(tipos_unicos)))
         mapa_colores = dict(zip(tipos_unicos, colores))
 
         # Crear figura única para navegación
@@ -131,7 +189,7 @@ class OptimizadorEmpaquetadoMultiContenedor2D(OptimizadorEmpaquetadoMultiContene
             # Dibujar cada paquete
             for paquete in contenedor['paquetes']:
                 # Obtener el tipo base del paquete (sin la rotación)
-                tipo_base = paquete['tipo'].split('_')[0]
+                tipo_base = self.tipos_paquetes[paquete['id_tipo']].nombre
                 color = mapa_colores[tipo_base]
 
                 x, y = paquete['posicion']
@@ -1,8 +1,9 @@
 from modelo.datos import RequisitosContenedor, Paquete
 import numpy as np
 from modelo.bpga_core import OptimizadorEmpaquetadoMultiContenedor
-import matplotlib.pyplot as plt
-from mpl_toolkits.mplot3d.art3d import Poly3DCollection
+from modelo.rejilla_ocupacion import MapaAlturas
+from modelo.indice_espacial import IndiceEspacial
+from modelo.puntos_extremos import PuntosExtremos3D
 
 def vertices_caja(pos, dims):
     """Crea los vértices de una caja 3D dada su posición y dimensiones"""
@@ -26,6 +27,10 @@ def caras_caja(vertices):
     ]
     return faces
 
+# 'rejilla' recorre todas las celdas (modo de referencia), 'puntos_extremos' solo las esquinas candidatas,
+# 'ocupacion_numpy' apoya cada paquete sobre un mapa de alturas (sin huecos bajo paquetes salientes)
+MOTORES_COLOCACION_3D = ('rejilla', 'puntos_extremos', 'ocupacion_numpy')
+
 class OptimizadorEmpaquetadoMultiContenedor3D(OptimizadorEmpaquetadoMultiContenedor):
     def __init__(self,
                  requisitos_contenedores: list[RequisitosContenedor],
@@ -34,10 +39,28 @@ class OptimizadorEmpaquetadoMultiContenedor3D(OptimizadorEmpaquetadoMultiContene
                  tamano_poblacion: int = 1000,
                  generaciones: int = 55,
                  prob_cruce: float = 0.618,
-                 prob_mutacion: float = 0.021) -> None:
-
+                 prob_mutacion: float = 0.021,
+                 tamano_cache_aptitud: int = 10000,
+                 tamano_cache_colocacion: int = 20000,
+                 max_paquetes_cache_colocacion: int = 2000000,
+                 colocacion_incremental: bool = False,
+                 max_nodos_prefijos: int = 100000,
+                 max_bytes_prefijos: int = 256 * 2 ** 20,
+                 trabajadores: int = 1,
+                 tamano_lote_trabajadores: int = None,
+                 representacion_compacta: bool = False,
+                 instrumentacion: bool = False,
+                 motor_colocacion: str = 'rejilla',
+                 indice_espacial: bool = False) -> None:
+
+        if motor_colocacion not in MOTORES_COLOCACION_3D:
+            raise ValueError(f"Motor de colocación desconocido: {motor_colocacion}")
+        self.motor_colocacion = motor_colocacion
+        self.indice_espacial = indice_espacial
         super().__init__(requisitos_contenedores, tipos_paquetes, rotaciones_permitidas, tamano_poblacion, generaciones,
-                         prob_cruce, prob_mutacion)
+                         prob_cruce, prob_mutacion, tamano_cache_aptitud, tamano_cache_colocacion,
+                         max_paquetes_cache_colocacion, colocacion_incremental, max_nodos_prefijos, max_bytes_prefijos,
+                         trabajadores, tamano_lote_trabajadores, representacion_compacta, instrumentacion)
 
     def _generar_rotaciones_paquete(self, paquete: Paquete, indice : int) -> list[tuple]:
         """Genera todas las rotaciones únicas permitidas para un paquete"""
@@ -60,19 +83,34 @@ class OptimizadorEmpaquetadoMultiContenedor3D(OptimizadorEmpaquetadoMultiContene
 
         return rotaciones_tipo
 
-    def _first_fit(self, colocado, dimensiones_contenedor, paquetes_colocados, paso_rejilla, rotaciones):
+    def _crear_estado_contenedor(self, dimensiones_contenedor):
+        if self.motor_colocacion == 'puntos_extremos':
+            return PuntosExtremos3D(dimensiones_contenedor, self._crear_indice_espacial())
+        if self.motor_colocacion == 'ocupacion_numpy':
+            return MapaAlturas(dimensiones_contenedor)
+        return self._crear_indice_espacial()
+
+    def _first_fit(self, colocado, dimensiones_contenedor, paquetes_colocados, paso_rejilla, rotaciones, estado=None):
+        if self.motor_colocacion == 'puntos_extremos':
+            return self._first_fit_puntos_extremos(colocado, dimensiones_contenedor, paquetes_colocados,
+                                                   rotaciones, estado)
+        if self.motor_colocacion == 'ocupacion_numpy':
+            return self._first_fit_ocupacion(colocado, paquetes_colocados, paso_rejilla, rotaciones, estado)
+
         for rotacion in rotaciones:
-            nombre_rot, l_rot, a_rot, h_rot = rotacion
+            id_rot, l_rot, a_rot, h_rot = rotacion
 
             for x in range(0, dimensiones_contenedor[0] - l_rot + 1, paso_rejilla):
                 for y in range(0, dimensiones_contenedor[1] - a_rot + 1, paso_rejilla):
                     for z in range(0, dimensiones_contenedor[2] - h_rot + 1, paso_rejilla):
                         if self._puede_colocar_paquete(paquetes_colocados,
-                                                       (nombre_rot, l_rot, a_rot, h_rot), (x, y, z),
-                                                       dimensiones_contenedor):
+                                                       (id_rot, l_rot, a_rot, h_rot), (x, y, z),
+                                                       dimensiones_contenedor, estado):
                             paquetes_colocados.append(
-                                (x, y, z, l_rot, a_rot, h_rot, nombre_rot)
+                                (x, y, z, l_rot, a_rot, h_rot, id_rot)
                             )
+                            if estado is not None:
+                                estado.agregar(paquetes_colocados[-1])
                             colocado = True
                             break
                     if colocado:
@@ -83,7 +121,28 @@ class OptimizadorEmpaquetadoMultiContenedor3D(OptimizadorEmpaquetadoMultiContene
                 break
         return colocado
 
-    def _puede_colocar_paquete(self, paquetes_existentes, nuevo_paquete, posicion, dimensiones_contenedor) -> bool:
+    def _first_fit_puntos_extremos(self, colocado, dimensiones_contenedor, paquetes_colocados, rotaciones,
+                                   puntos: PuntosExtremos3D):
+        """Prueba cada rotación solo en los puntos extremos del contenedor"""
+        for rotacion in rotaciones:
+            id_rot, l_rot, a_rot, h_rot = rotacion
+
+            for x, y, z in puntos.candidatos():
+                if self._puede_colocar_paquete(paquetes_colocados,
+                                               (id_rot, l_rot, a_rot, h_rot), (x, y, z),
+                                               dimensiones_contenedor, puntos.indice):
+                    paquetes_colocados.append(
+                        (x, y, z, l_rot, a_rot, h_rot, id_rot)
+                    )
+                    puntos.agregar_paquete(paquetes_colocados)
+                    colocado = True
+                    break
+            if colocado:
+                break
+        return colocado
+
+    def _puede_colocar_paquete(self, paquetes_existentes, nuevo_paquete, posicion, dimensiones_contenedor,
+                               indice: IndiceEspacial = None) -> bool:
         """Verifica si un paquete puede ser colocado en la posición dada"""
         x, y, z = posicion
         l, a, h = nuevo_paquete[1:4]
@@ -93,6 +152,10 @@ class OptimizadorEmpaquetadoMultiContenedor3D(OptimizadorEmpaquetadoMultiContene
                 z + h > dimensiones_contenedor[2]):
             return False
 
+        # Con índice espacial solo se revisan los paquetes de las celdas cercanas
+        if indice is not None:
+            paquetes_existentes = indice.cercanos(posicion, (l, a, h))
+
         for paq in paquetes_existentes:
             px, py, pz, pl, pa, ph, _ = paq
             if not (x + l <= px or px + pl <= x or
@@ -102,10 +165,7 @@ class OptimizadorEmpaquetadoMultiContenedor3D(OptimizadorEmpaquetadoMultiContene
         return True
 
     def _conteo_paquetes(self, cantidad_total, dimensiones_contenedor, paquetes_colocados):
-        for paq in paquetes_colocados:
-            # Extraer el nombre original del paquete sin la rotación
-            nombre_original = paq[6].split('_')[0]
-            cantidad_total[nombre_original] += 1
+        self._contar_tipos(cantidad_total, paquetes_colocados)
         # Calcular volúmenes
         volumen_contenedor = np.prod(dimensiones_contenedor)
         volumen_utilizado = sum(paq[3] * paq[4] * paq[5] for paq in paquetes_colocados)
@@ -114,7 +174,8 @@ class OptimizadorEmpaquetadoMultiContenedor3D(OptimizadorEmpaquetadoMultiContene
     def _contenedor_info(self, contenedor_info, paquetes_colocados):
         contenedor_info['paquetes'] = [
             {
-                'tipo': paq[6],  # Nombre con rotación incluida
+                'tipo': self.nombres_rotacion[paq[6]],  # Nombre con rotación incluida
+                'id_tipo': int(self.tipo_rotacion[paq[6]]),
                 'posicion': (paq[0], paq[1], paq[2]),
                 'dimensiones': (paq[3], paq[4], paq[5])
             } for paq in paquetes_colocados
@@ -128,6 +189,8 @@ class OptimizadorEmpaquetadoMultiContenedor3D(OptimizadorEmpaquetadoMultiContene
         Args:
             resultado (dict): Diccionario con los resultados de la optimización
         """
+        import matplotlib.pyplot as plt
+        from mpl_toolkits.mplot3d.art3d import Poly3DCollection
 
         # Filtrar contenedores en uso
         contenedores_en_uso = [cont for cont in resultado['posiciones']['contenedores'] if cont['en_uso']]
@@ -140,9 +203,9 @@ class OptimizadorEmpaquetadoMultiContenedor3D(OptimizadorEmpaquetadoMultiContene
         tipos_unicos = set()
         for cont in contenedores_en_uso:
             for paq in cont['paquetes']:
-                tipos_unicos.add(paq['tipo'].split('_')[0])  # Usar nombre base sin rotación
+                tipos_unicos.add(self.tipos_paquetes[paq['id_tipo']].nombre)
 
-        colores = plt.cm.get_cmap('tab20')(np.linspace(0, 1, len(tipos_unicos)))
+        colores = plt.get_cmap('tab20')(np.linspace(0, 1, len(tipos_unicos)))
         color_map = dict(zip(tipos_unicos, colores))
 
         # Crear figura única para navegación
@@ -170,7 +233,7 @@ class OptimizadorEmpaquetadoMultiContenedor3D(OptimizadorEmpaquetadoMultiContene
             for paquete in contenedor['paquetes']:
                 vertices_paq = vertices_caja(paquete['posicion'], paquete['dimensiones'])
                 faces_paq = caras_caja(vertices_paq)
-                tipo_base = paquete['tipo'].split('_')[0]
+                tipo_base = self.tipos_paquetes[paquete['id_tipo']].nombre
                 color = color_map[tipo_base]
                 paq_poly = Poly3DCollection(faces_paq, alpha=0.6, facecolor=color)
                 ax.add_collection3d(paq_poly)
@@ -1,10 +1,22 @@
+import csv
 import random
+import math
+import time
+from contextlib import contextmanager, closing, nullcontext
 from modelo.datos import RequisitosContenedor, Paquete
-from deap import base, creator, tools, algorithms
+from modelo.cache import CacheLRU
+from modelo.indice_espacial import IndiceEspacial
+from modelo.trie_prefijos import TriePrefijos, bytes_nodo
+from modelo.paralelo import EvaluadorParalelo
+from modelo.islas import ModeloIslas
+from modelo.reinicios import ejecutar_reinicios
+from modelo.instrumentacion import Instrumentacion, columnas_instrumentacion
+from modelo.punto_control import EscritorPuntosControl, capturar_estado, cargar_punto_control
+from modelo.tipos_deap import Individuo, IndividuoCompacto
+from modelo.compacto import comprimir_colocacion, registros_a_diccionarios
+from deap import base, tools, algorithms
 from abc import ABC, abstractmethod
 import numpy as np
-from matplotlib import pyplot as plt
-plt.switch_backend('Qt5Agg')
 
 class OptimizadorEmpaquetadoMultiContenedor(ABC):
     def __init__(self,
@@ -14,7 +26,17 @@ class OptimizadorEmpaquetadoMultiContenedor(ABC):
                  tamano_poblacion: int = 1000,
                  generaciones: int = 55,
                  prob_cruce: float = 0.618,
-                 prob_mutacion: float = 0.021) -> None:
+                 prob_mutacion: float = 0.021,
+                 tamano_cache_aptitud: int = 10000,
+                 tamano_cache_colocacion: int = 20000,
+                 max_paquetes_cache_colocacion: int = 2000000,
+                 colocacion_incremental: bool = False,
+                 max_nodos_prefijos: int = 100000,
+                 max_bytes_prefijos: int = 256 * 2 ** 20,
+                 trabajadores: int = 1,
+                 tamano_lote_trabajadores: int = None,
+                 representacion_compacta: bool = False,
+                 instrumentacion: bool = False) -> None:
   
         self.requisitos_contenedores = requisitos_contenedores
         self.tipos_paquetes = tipos_paquetes
@@ -22,35 +44,95 @@ class OptimizadorEmpaquetadoMultiContenedor(ABC):
         self.generaciones = generaciones
         self.prob_cruce = prob_cruce
         self.prob_mutacion = prob_mutacion
+        # _mutar modifica prob_mutacion durante la ejecución; cada ejecución nueva parte de este valor
+        self.prob_mutacion_inicial = prob_mutacion
         self.rotaciones_permitidas = rotaciones_permitidas
+        # Número de cromosomas cuya aptitud se recuerda (0 desactiva la caché)
+        self.tamano_cache_aptitud = tamano_cache_aptitud
+        # Colocaciones por contenedor que se recuerdan y total de paquetes colocados guardados
+        self.tamano_cache_colocacion = tamano_cache_colocacion
+        self.max_paquetes_cache_colocacion = max_paquetes_cache_colocacion
+        # Reanudar la colocación desde el prefijo de cantidades más largo ya colocado
+        self.colocacion_incremental = colocacion_incremental
+        self.max_nodos_prefijos = max_nodos_prefijos
+        # Límite de memoria de los estados guardados en el trie (las rejillas de NumPy pesan mucho más que un nodo)
+        self.max_bytes_prefijos = max_bytes_prefijos
+        # Procesos para evaluar aptitudes (1 evalúa en el proceso actual) y tamaño de lote por envío
+        self.trabajadores = trabajadores
+        self.tamano_lote_trabajadores = tamano_lote_trabajadores
+        # Individuos sobre array('i') y colocaciones en caché como arreglos estructurados
+        self.representacion_compacta = representacion_compacta
+        # Tiempo y llamadas por fase en el logbook (desactivada no añade coste a la colocación)
+        self.instrumentacion = instrumentacion
+        self._configurar()
+
+    def __getstate__(self) -> dict:
+        """Al serializar solo viajan los datos del problema; lo demás se reconstruye al cargar"""
+        estado = self.__dict__.copy()
+        for campo in ('toolbox', 'stats', 'logbook', 'cache_aptitud', 'cache_colocacion', 'trie_prefijos',
+                      'fases', '_first_fit', '_puede_colocar_paquete'):
+            estado.pop(campo, None)
+        return estado
+
+    def __setstate__(self, estado: dict) -> None:
+        self.__dict__.update(estado)
         self._configurar()
 
     def _configurar(self):
-        
-        # Eliminar clases creadas previamente
-        if hasattr(creator, 'FitnessMax'):
-            delattr(creator, 'FitnessMax')
-        if hasattr(creator, 'Individual'):
-            delattr(creator, 'Individual')
         self.num_contenedores = len(self.requisitos_contenedores)
         self.num_tipos_paquetes = len(self.tipos_paquetes)
-        self.rotaciones_precalculadas = {
-            tipo_paquete.nombre: self._generar_rotaciones_paquete(tipo_paquete, indice)
-            for indice, tipo_paquete in enumerate(self.tipos_paquetes)
-        }
+        # Rotaciones por índice de tipo; cada una lleva su índice global en lugar del nombre
+        self.rotaciones_precalculadas = []
+        self.nombres_rotacion = []
+        tipo_rotacion = []
+        for indice, tipo_paquete in enumerate(self.tipos_paquetes):
+            rotaciones = []
+            for rotacion in self._generar_rotaciones_paquete(tipo_paquete, indice):
+                rotaciones.append(self._rotacion_con_indice(rotacion, len(self.nombres_rotacion)))
+                self.nombres_rotacion.append(self._nombre_rotacion(rotacion))
+                tipo_rotacion.append(indice)
+            self.rotaciones_precalculadas.append(rotaciones)
+        # Índice del tipo de paquete de cada rotación global
+        self.tipo_rotacion = np.array(tipo_rotacion, dtype=np.int64)
+        # Celdas del índice espacial (2D y 3D) del tamaño del paquete más grande en cada eje;
+        # allí las rotaciones son (id, dimensiones...)
+        ejes = len(self.requisitos_contenedores[0].dimensiones)
+        self.tamano_celda_indice = tuple(
+            max(rotacion[1 + eje] for rotaciones in self.rotaciones_precalculadas for rotacion in rotaciones)
+            for eje in range(ejes)
+        ) if ejes > 1 else None
         self.stats = tools.Statistics(key=lambda ind: ind.fitness.values)
         self.stats.register("desviación", np.std)
         self.stats.register("promedio", np.mean)
         self.stats.register("mínimo", np.min)
         self.stats.register("máximo", np.max)
         self.logbook = tools.Logbook()
+        self.cache_aptitud = CacheLRU(self.tamano_cache_aptitud) if self.tamano_cache_aptitud > 0 else None
+        self.cache_colocacion = CacheLRU(
+            self.tamano_cache_colocacion,
+            peso_maximo=self.max_paquetes_cache_colocacion,
+            peso=lambda colocacion: len(colocacion[0]) + 1
+        ) if self.tamano_cache_colocacion > 0 else None
+        self.trie_prefijos = TriePrefijos(
+            self.max_nodos_prefijos,
+            peso_maximo=self.max_bytes_prefijos,
+            peso=bytes_nodo
+        ) if self.colocacion_incremental else None
+        # Colocaciones de tipos de paquete que las cotas permitieron saltarse
+        self.atajos = dict.fromkeys(('atajos_vacios', 'atajos_ejes', 'atajos_volumen'), 0)
+        # Con instrumentación los métodos de colocación se sustituyen en la instancia por versiones medidas
+        self.fases = Instrumentacion() if self.instrumentacion else None
+        if self.fases is not None:
+            self._first_fit = self.fases.envolver('first_fit', self._first_fit)
+            self._puede_colocar_paquete = self.fases.envolver('puede_colocar', self._puede_colocar_paquete)
         # Inicializar componentes DEAP
         self._configurar_deap()
 
     def _configurar_deap(self) -> None:
-        """Inicializa el creador y toolbox de DEAP para múltiples contenedores"""
-        creator.create("FitnessMax", base.Fitness, weights=(1.0,))
-        creator.create("Individual", list, fitness=creator.FitnessMax)
+        """Inicializa el tipo de individuo y el toolbox de DEAP para múltiples contenedores"""
+        # Tipos de módulo de tipos_deap en lugar de creator: no guardan estado,
+        # así que compartirlos entre optimizadores es seguro
+        self.tipo_individuo = IndividuoCompacto if self.representacion_compacta else Individuo
 
         self.toolbox = base.Toolbox()
 
@@ -58,10 +140,13 @@ class OptimizadorEmpaquetadoMultiContenedor(ABC):
         atributos = []
         self.registrar_attrs(atributos)
 
-        self.toolbox.register("individual", tools.initCycle, creator.Individual, atributos, n=1)
+        self.toolbox.register("individual", tools.initCycle, self.tipo_individuo, atributos, n=1)
         self.toolbox.register("population", tools.initRepeat, list, self.toolbox.individual)
 
-        self.toolbox.register("evaluate", self._evaluar_aptitud)
+        if self.cache_aptitud is not None:
+            self.toolbox.register("evaluate", self._evaluar_aptitud_cacheada)
+        else:
+            self.toolbox.register("evaluate", self._evaluar_aptitud)
         self.toolbox.register("mate", tools.cxUniform, indpb=self.prob_cruce)
         self.toolbox.register("mutate", self._mutar)
         self.toolbox.register("select", tools.selTournament, tournsize=3)
@@ -99,44 +184,233 @@ class OptimizadorEmpaquetadoMultiContenedor(ABC):
         """Genera todas las rotaciones posibles para un tipo de paquete"""
         pass
 
-    def optimizar(self, semilla=None) -> dict:
-        """Ejecuta la optimización del algoritmo genético para múltiples contenedores"""
+    def optimizar(self, semilla=None, progreso=None, ruta_punto_control: str = None,
+                  intervalo_punto_control: int = 10) -> dict:
+        """
+        Ejecuta la optimización del algoritmo genético para múltiples contenedores.
+        progreso, si se indica, recibe el registro de cada generación (ver
+        iterar_generaciones); si devuelve True la optimización se detiene ahí.
+        Con ruta_punto_control se guarda el estado cada intervalo_punto_control generaciones
+        """
+        return self._consumir_generaciones(
+            self.iterar_generaciones(semilla, ruta_punto_control, intervalo_punto_control), progreso)
+
+    def reanudar(self, ruta_punto_control: str, progreso=None, intervalo_punto_control: int = 10) -> dict:
+        """Continúa la optimización desde el punto de control con el mismo resultado que sin interrupción"""
+        estado = cargar_punto_control(ruta_punto_control)
+        # Si el punto de control es de la última generación no queda ninguna por ejecutar:
+        # el resultado sale del mejor individuo guardado
+        registro = {'mejor_individuo': estado['mejor_individuo'], 'mejor_aptitud': estado['mejor_aptitud']}
+        return self._consumir_generaciones(
+            self._iterar_desde_punto_control(estado, ruta_punto_control, intervalo_punto_control), progreso, registro)
+
+    def _consumir_generaciones(self, generaciones, progreso, registro: dict = None) -> dict:
+        """Consume las generaciones y devuelve el resultado del último registro (o del registro dado si no hay)"""
+        with closing(generaciones):
+            for registro in generaciones:
+                if progreso is not None and progreso(registro):
+                    break
+        return self.resultado_desde_registro(registro)
+
+    def iterar_generaciones(self, semilla=None, ruta_punto_control: str = None, intervalo_punto_control: int = 10):
+        """
+        Generador que ejecuta la optimización y entrega un registro por generación con
+        'gen', 'estadisticas' (la fila del logbook), 'mejor_aptitud', 'mejor_individuo',
+        'tiempos' (segundos de variación, evaluación y selección), 'evaluaciones' y
+        'evaluaciones_por_segundo'. Se puede dejar de consumir en cualquier momento;
+        resultado_desde_registro convierte el último registro en el resultado final
+        """
         if semilla is not None:
             random.seed(semilla)
+        # Una ejecución anterior sobre la misma instancia no debe influir en esta
+        self.prob_mutacion = self.prob_mutacion_inicial
+        self.logbook = tools.Logbook()
 
         poblacion = self.toolbox.population(n=self.tamano_poblacion)
-        mejor_individuo = None
-        mejor_aptitud = 0.0
-        mejor_resultado = None
-
-
+        yield from self._iterar_desde(0, poblacion, None, 0.0, ruta_punto_control, intervalo_punto_control)
+
+    def iterar_reanudacion(self, ruta_punto_control: str, intervalo_punto_control: int = 10):
+        """Como iterar_generaciones, pero continuando desde el punto de control y guardando en la misma ruta"""
+        yield from self._iterar_desde_punto_control(cargar_punto_control(ruta_punto_control), ruta_punto_control,
+                                                    intervalo_punto_control)
+
+    def _iterar_desde_punto_control(self, estado: dict, ruta_punto_control: str, intervalo_punto_control: int):
+        genes_por_individuo = self.num_contenedores * (1 + self.num_tipos_paquetes)
+        if estado['genes'].shape[1] != genes_por_individuo:
+            raise ValueError("El punto de control no corresponde a este problema")
+
+        poblacion = []
+        for genes, aptitud in zip(estado['genes'].tolist(), estado['aptitudes'].tolist()):
+            individuo = self._crear_individuo(genes)
+            individuo.fitness.values = (aptitud,)
+            poblacion.append(individuo)
+        self.logbook = tools.Logbook()
+        self.logbook.header, filas = estado['logbook']
+        self.logbook.extend(filas)
+        self.logbook.buffindex = len(filas)
+        random.setstate(estado['random'])
+        self.prob_mutacion = estado['prob_mutacion']
+
+        yield from self._iterar_desde(estado['gen'] + 1, poblacion, estado['mejor_individuo'], estado['mejor_aptitud'],
+                                      ruta_punto_control, intervalo_punto_control)
+
+    def _iterar_desde(self, gen_inicial: int, poblacion: list, mejor_individuo, mejor_aptitud: float,
+                      ruta_punto_control: str, intervalo_punto_control: int):
+        """Bucle de generaciones desde gen_inicial con la población y el mejor individuo dados"""
         self.logbook.header = "gen", "desviación", "mínimo", "promedio", "máximo"
+        if self.cache_aptitud is not None:
+            self.logbook.header += "aciertos_cache", "fallos_cache"
+            self.cache_aptitud.tomar_contadores()
+        if self.cache_colocacion is not None:
+            self.logbook.header += "aciertos_colocacion", "fallos_colocacion"
+            self.cache_colocacion.tomar_contadores()
+        self.logbook.header += tuple(self.atajos)
+        self._tomar_atajos()
+        if self.fases is not None:
+            self.logbook.header += columnas_instrumentacion()
+            self.fases.tomar()
+
+        escritor = EscritorPuntosControl(ruta_punto_control) if ruta_punto_control is not None else None
+        with self._evaluacion_paralela(), escritor or nullcontext():
+            for gen in range(gen_inicial, self.generaciones):
+                poblacion, descendencia, tiempos = self._paso_generacion(poblacion)
+                for ind in descendencia:
+                    if ind.fitness.values[0] > mejor_aptitud:
+                        mejor_aptitud = ind.fitness.values[0]
+                        mejor_individuo = list(ind)
+
+                inicio_estadisticas = time.perf_counter()
+                registro = self.stats.compile(poblacion)
+                if self.fases is not None:
+                    for fase, segundos in tiempos.items():
+                        self.fases.sumar(fase, segundos)
+                    self.fases.sumar('estadisticas', time.perf_counter() - inicio_estadisticas)
+                    registro.update(self.fases.tomar())
+                if self.cache_aptitud is not None:
+                    registro['aciertos_cache'], registro['fallos_cache'] = self.cache_aptitud.tomar_contadores()
+                if self.cache_colocacion is not None:
+                    registro['aciertos_colocacion'], registro['fallos_colocacion'] = \
+                        self.cache_colocacion.tomar_contadores()
+                registro.update(self._tomar_atajos())
+                self.logbook.record(gen=gen, evals=len(poblacion), **registro)
+
+                # Imprimir estadísticas de la generación
+                print(self.logbook.stream)
+                yield {
+                    'gen': gen,
+                    'estadisticas': dict(self.logbook[-1]),
+                    'mejor_aptitud': mejor_aptitud,
+                    'mejor_individuo': None if mejor_individuo is None else list(mejor_individuo),
+                    'tiempos': tiempos,
+                    'evaluaciones': len(descendencia),
+                    'evaluaciones_por_segundo': len(descendencia) / max(tiempos['evaluacion'], 1e-9)
+                }
+                desviacion = self.logbook.select("desviación")[-1]
+
+                #Parar si ya se ha encontrado la solución
+                if mejor_aptitud >= 1.00 or desviacion <= 0.001:
+                    break
 
-        for gen in range(self.generaciones):
-            descendencia = algorithms.varAnd(poblacion, self.toolbox, self.prob_cruce, self.prob_mutacion)
-
-            aptitudes = map(self.toolbox.evaluate, descendencia)
-
-            for aptitud, ind in zip(aptitudes, descendencia):
-                ind.fitness.values = aptitud
-                if aptitud[0] > mejor_aptitud:
-                    mejor_aptitud = aptitud[0]
-                    mejor_individuo = ind.copy()
-                    mejor_resultado = self.obtener_posiciones_paquetes(ind)
-
-
+                # El punto de control se toma al final de la generación, con el estado de random de ese momento
+                if escritor is not None and (gen + 1) % intervalo_punto_control == 0:
+                    escritor.guardar(capturar_estado(gen, poblacion, self.logbook, mejor_individuo, mejor_aptitud,
+                                                     random.getstate(), self.prob_mutacion))
+
+    def optimizar_islas(self, num_islas: int, intervalo_migracion: int = 5, num_migrantes: int = 2,
+                        topologia: str = 'anillo', semilla=None) -> dict:
+        """
+        Ejecuta la optimización con num_islas poblaciones de tamano_poblacion individuos,
+        cada una en su proceso, que cada intervalo_migracion generaciones envían sus
+        num_migrantes mejores individuos a otra isla (topología 'anillo' o 'aleatoria')
+        """
+        islas = ModeloIslas(self, num_islas, intervalo_migracion, num_migrantes, topologia, semilla)
+        mejor_individuo = None
+        mejor_aptitud = 0.0
+        gen = 0
 
-            poblacion = self.toolbox.select(descendencia, k=len(poblacion))
-            registro = self.stats.compile(poblacion)
-            self.logbook.record(gen=gen, evals=len(poblacion), **registro)
+        self.logbook = tools.Logbook()
+        self.logbook.header = "gen", "isla", "desviación", "mínimo", "promedio", "máximo"
+        with closing(islas.ejecutar(self.generaciones)) as epocas:
+            for respuestas in epocas:
+                for desplazamiento in range(len(respuestas[0]['registros'])):
+                    for isla, respuesta in enumerate(respuestas):
+                        self.logbook.record(gen=gen + desplazamiento, isla=isla, **respuesta['registros'][desplazamiento])
+                for respuesta in respuestas:
+                    if respuesta['mejor_aptitud'] > mejor_aptitud:
+                        mejor_aptitud = respuesta['mejor_aptitud']
+                        mejor_individuo = respuesta['mejor_individuo']
+                gen += len(respuestas[0]['registros'])
+
+                # Imprimir estadísticas de la época
+                print(self.logbook.stream)
+
+                #Parar si ya se ha encontrado la solución
+                if mejor_aptitud >= 1.00:
+                    break
 
-            # Imprimir estadísticas de la generación
-            print(self.logbook.stream)
-            desviacion = self.logbook.select("desviación")[-1]
+        return self.resultado_desde_registro({'mejor_individuo': mejor_individuo, 'mejor_aptitud': mejor_aptitud})
+
+    def optimizar_reinicios(self, semillas, procesos: int = None, tiempo_maximo: float = None,
+                            evaluaciones_maximas: int = None, aptitud_objetivo: float = None) -> dict:
+        """
+        Ejecuta una optimización independiente por semilla en paralelo con un presupuesto
+        compartido de tiempo o evaluaciones y devuelve el mejor resultado; 'semillas'
+        del resultado resume cada semilla. Al alcanzar aptitud_objetivo se cancelan las demás
+        """
+        if isinstance(semillas, int):
+            semillas = list(range(semillas))
+        resumenes = ejecutar_reinicios(self, list(semillas), procesos, tiempo_maximo, evaluaciones_maximas,
+                                       aptitud_objetivo)
+        mejor = max(resumenes, key=lambda r: r['aptitud'])
+        resultado = self.resultado_desde_registro({'mejor_individuo': mejor['individuo'],
+                                                   'mejor_aptitud': mejor['aptitud']})
+        resultado['semilla'] = mejor['semilla']
+        resultado['semillas'] = [{k: v for k, v in r.items() if k != 'individuo'} for r in resumenes]
+        return resultado
+
+    def _paso_generacion(self, poblacion: list) -> tuple[list, list, dict]:
+        """Variación, evaluación y selección de una generación; devuelve la nueva población, la descendencia y los tiempos"""
+        inicio = time.perf_counter()
+        descendencia = algorithms.varAnd(poblacion, self.toolbox, self.prob_cruce, self.prob_mutacion)
+        fin_variacion = time.perf_counter()
+
+        aptitudes = self._evaluar_poblacion(descendencia)
+        for aptitud, ind in zip(aptitudes, descendencia):
+            ind.fitness.values = aptitud
+        fin_evaluacion = time.perf_counter()
+
+        poblacion = self.toolbox.select(descendencia, k=len(poblacion))
+        fin_seleccion = time.perf_counter()
+        return poblacion, descendencia, {
+            'variacion': fin_variacion - inicio,
+            'evaluacion': fin_evaluacion - fin_variacion,
+            'seleccion': fin_seleccion - fin_evaluacion
+        }
 
-            #Parar si ya se ha encontrado la solución
-            if mejor_aptitud >= 1.00 or desviacion <= 0.001:
-                break
+    def exportar_instrumentacion(self, ruta: str) -> None:
+        """Escribe en CSV los tiempos y llamadas por fase de cada generación registrada en el logbook"""
+        if self.fases is None:
+            raise ValueError("La instrumentación no está activada")
+        columnas = ('gen',) + columnas_instrumentacion()
+        with open(ruta, 'w', newline='', encoding='utf-8') as archivo:
+            escritor = csv.writer(archivo)
+            escritor.writerow(columnas)
+            for fila in self.logbook:
+                escritor.writerow([fila.get(columna) for columna in columnas])
+
+    def _crear_individuo(self, genes):
+        """Individuo del tipo de DEAP del optimizador con los genes dados (sin aptitud)"""
+        return self.tipo_individuo(genes)
+
+    def resultado_desde_registro(self, registro: dict) -> dict:
+        """Resultado final (individuo, aptitud y posiciones) a partir del último registro de iterar_generaciones"""
+        mejor_individuo = None if registro is None else registro['mejor_individuo']
+        mejor_aptitud = 0.0 if registro is None else registro['mejor_aptitud']
+
+        # Las posiciones del mejor individuo se obtienen una sola vez, al terminar
+        mejor_resultado = None
+        if mejor_individuo is not None:
+            mejor_resultado = self.obtener_posiciones_paquetes(mejor_individuo)
 
         return {
             'individuo': mejor_individuo,
@@ -144,35 +418,194 @@ class OptimizadorEmpaquetadoMultiContenedor(ABC):
             'posiciones': mejor_resultado
         }
 
+    def _evaluar_poblacion(self, individuos) -> list[tuple[float]]:
+        """Evalúa la aptitud de todos los individuos de una generación"""
+        return list(self.toolbox.map(self.toolbox.evaluate, individuos))
+
+    @contextmanager
+    def _evaluacion_paralela(self):
+        """Registra en el toolbox un map sobre un grupo de procesos mientras dura la optimización"""
+        if self.trabajadores <= 1:
+            yield
+            return
+
+        evaluador = EvaluadorParalelo(self, self.trabajadores, self.tamano_lote_trabajadores)
+        self.toolbox.register("map", evaluador.map)
+        try:
+            yield
+        finally:
+            self.toolbox.register("map", map)
+            evaluador.cerrar()
+
     def _colocar_paquetes_en_contenedor(self, genes_contenedor, indice_contenedor) -> tuple[list, tuple]:
         """Coloca paquetes en un contenedor específico con múltiples rotaciones"""
-        paquetes_colocados = []
         dimensiones_contenedor = self.requisitos_contenedores[indice_contenedor].dimensiones
-        paso_rejilla = 1
+
+        # Sin paquetes pedidos la colocación es vacía: no hace falta crear el estado del motor
+        if not any(genes_contenedor[1:]):
+            self.atajos['atajos_vacios'] += 1
+            return [], dimensiones_contenedor
+
+        if self.trie_prefijos is not None:
+            return self._colocar_paquetes_incremental(genes_contenedor, indice_contenedor)
+
+        paquetes_colocados = []
+        estado = self._crear_estado_contenedor(dimensiones_contenedor)
 
         for i in range(1, len(genes_contenedor)):
-            tipo_paquete_idx = i - 1
-            cantidad = genes_contenedor[i]
-
-            # Si la cantidad es 0, continuar con el siguiente tipo
-            if cantidad == 0:
-                continue
-
-            tipo_paquete = self.tipos_paquetes[tipo_paquete_idx]
-            # Generar todas las posibles rotaciones para este tipo de paquete
-            rotaciones = self.rotaciones_precalculadas[tipo_paquete.nombre]
-
-            for _ in range(cantidad):
-                colocado = False
-                colocado = self._first_fit(colocado, dimensiones_contenedor, paquetes_colocados, paso_rejilla,
-                                           rotaciones)
-                if not colocado:
-                    break
+            self._colocar_tipo_paquete(i - 1, genes_contenedor[i], dimensiones_contenedor, paquetes_colocados,
+                                       estado)
+
+        return paquetes_colocados, dimensiones_contenedor
+
+    def _colocar_paquetes_incremental(self, genes_contenedor, indice_contenedor) -> tuple[list, tuple]:
+        """
+        Coloca paquetes continuando desde el prefijo de cantidades más largo guardado en el trie;
+        los tipos se colocan en orden, así que el resultado es el mismo que colocando desde cero
+        """
+        dimensiones_contenedor = self.requisitos_contenedores[indice_contenedor].dimensiones
+        conteos = genes_contenedor[1:]
+        nodo, profundidad = self.trie_prefijos.prefijo_mas_largo(dimensiones_contenedor, conteos,
+                                                                 self._crear_estado_contenedor)
+        paquetes_colocados, estado = nodo.restaurar()
+
+        for tipo_paquete_idx in range(profundidad, len(conteos)):
+            cantidad = conteos[tipo_paquete_idx]
+            self._colocar_tipo_paquete(tipo_paquete_idx, cantidad, dimensiones_contenedor, paquetes_colocados,
+                                       estado)
+            nodo = self.trie_prefijos.agregar(nodo, cantidad, paquetes_colocados, estado)
 
         return paquetes_colocados, dimensiones_contenedor
 
+    def _colocar_tipo_paquete(self, tipo_paquete_idx, cantidad, dimensiones_contenedor, paquetes_colocados,
+                              estado) -> None:
+        """Coloca hasta cantidad paquetes de un tipo; se detiene en el primero que no cabe"""
+        paso_rejilla = 1
+
+        # Si la cantidad es 0, continuar con el siguiente tipo
+        if cantidad == 0:
+            return
+
+        # Rotaciones precalculadas para este tipo de paquete
+        rotaciones = self.rotaciones_precalculadas[tipo_paquete_idx]
+
+        # Ninguna rotación cabe en el contenedor: el primer intento fallaría y se pasaría al siguiente tipo
+        if not any(all(d <= c for d, c in zip(self._dimensiones_rotacion(rotacion), dimensiones_contenedor))
+                   for rotacion in rotaciones):
+            self.atajos['atajos_ejes'] += 1
+            return
+
+        volumen_paquete = math.prod(self._dimensiones_rotacion(rotaciones[0]))
+        volumen_libre = self._volumen_libre(dimensiones_contenedor, paquetes_colocados)
+
+        for _ in range(cantidad):
+            # Si el volumen libre no alcanza el intento fallaría sin importar la posición
+            if volumen_paquete > volumen_libre:
+                self.atajos['atajos_volumen'] += 1
+                break
+            colocado = False
+            colocado = self._first_fit(colocado, dimensiones_contenedor, paquetes_colocados, paso_rejilla,
+                                       rotaciones, estado)
+            if not colocado:
+                break
+            volumen_libre -= volumen_paquete
+
+    def _dimensiones_rotacion(self, rotacion: tuple) -> tuple:
+        """Dimensiones de una rotación precalculada (nombre, l, a[, h])"""
+        return rotacion[1:]
+
+    @staticmethod
+    def _volumen_libre(dimensiones_contenedor, paquetes_colocados) -> int:
+        """Volumen del contenedor que no ocupan los paquetes colocados (x..., l..., nombre)"""
+        ejes = len(dimensiones_contenedor)
+        return math.prod(dimensiones_contenedor) - sum(math.prod(paq[ejes:2 * ejes]) for paq in paquetes_colocados)
+
+    def _tomar_atajos(self) -> dict:
+        """Devuelve los atajos contados desde la última llamada y reinicia los contadores"""
+        atajos = dict(self.atajos)
+        for clave in self.atajos:
+            self.atajos[clave] = 0
+        return atajos
+
+    def _colocar_paquetes_cacheado(self, genes_contenedor, indice_contenedor) -> tuple[list, tuple]:
+        """
+        Coloca los paquetes de un contenedor reutilizando la colocación de otro individuo
+        con los mismos genes en un contenedor de iguales dimensiones. La lista devuelta
+        se comparte entre individuos y no debe modificarse
+        """
+        if self.cache_colocacion is None:
+            return self._colocar_paquetes_en_contenedor(genes_contenedor, indice_contenedor)
+
+        dimensiones_contenedor = self.requisitos_contenedores[indice_contenedor].dimensiones
+        return self.cache_colocacion.obtener(
+            (dimensiones_contenedor, tuple(genes_contenedor[1:])),
+            lambda: self._colocar_paquetes_en_contenedor(genes_contenedor, indice_contenedor)
+        )
+
+    def _colocar_registros(self, genes_contenedor, indice_contenedor):
+        """
+        Colocación de un contenedor como arreglo estructurado compacto, guardado así en la caché.
+        En representación compacta la caché solo guarda registros: no mezclar con _colocar_paquetes_cacheado
+        """
+        dimensiones_contenedor = self.requisitos_contenedores[indice_contenedor].dimensiones
+
+        def colocar():
+            paquetes_colocados, _ = self._colocar_paquetes_en_contenedor(genes_contenedor, indice_contenedor)
+            registros = comprimir_colocacion(paquetes_colocados, len(dimensiones_contenedor))
+            return registros, dimensiones_contenedor
+
+        if self.cache_colocacion is None:
+            return colocar()[0]
+        return self.cache_colocacion.obtener((dimensiones_contenedor, tuple(genes_contenedor[1:])), colocar)[0]
+
+    def _nombre_rotacion(self, rotacion: tuple) -> str:
+        """Nombre de una rotación generada (nombre, l, a[, h])"""
+        return rotacion[0]
+
+    def _rotacion_con_indice(self, rotacion: tuple, id_rotacion: int) -> tuple:
+        """Sustituye el nombre de la rotación por su índice global: (id, l, a[, h])"""
+        return (id_rotacion, *rotacion[1:])
+
+    def _contar_tipos(self, cantidad_total, paquetes_colocados) -> None:
+        """Suma a cantidad_total los paquetes colocados de cada tipo (el último campo es el id de rotación)"""
+        if paquetes_colocados:
+            ids_rotacion = [paq[-1] for paq in paquetes_colocados]
+            cantidad_total += np.bincount(self.tipo_rotacion[ids_rotacion], minlength=self.num_tipos_paquetes)
+
+    def _conteo_registros(self, cantidad_total, dimensiones_contenedor, registros) -> tuple:
+        """Como _conteo_paquetes, pero sobre el arreglo estructurado de la representación compacta"""
+        if len(registros):
+            cantidad_total += np.bincount(self.tipo_rotacion[registros['rotacion']],
+                                          minlength=self.num_tipos_paquetes)
+        volumen_utilizado = int(np.prod(registros['dimensiones'], axis=1, dtype=np.int64).sum())
+        return np.prod(dimensiones_contenedor), volumen_utilizado
+
+    def _crear_estado_contenedor(self, dimensiones_contenedor):
+        """Crea la estructura auxiliar que el motor de colocación mantiene por contenedor"""
+        return None
+
+    def _crear_indice_espacial(self):
+        """Índice de cubetas para las pruebas de colisión en 2D y 3D, o None si está desactivado"""
+        if not self.indice_espacial:
+            return None
+        return IndiceEspacial(self.tamano_celda_indice)
+
+    def _first_fit_ocupacion(self, colocado, paquetes_colocados, paso_rejilla, rotaciones, rejilla):
+        """Busca con NumPy la primera posición factible de cada rotación (rejilla 2D o mapa de alturas 3D)"""
+        for rotacion in rotaciones:
+            id_rot, dimensiones = rotacion[0], rotacion[1:]
+            posicion = rejilla.primera_posicion(dimensiones, paso_rejilla)
+            if posicion is not None:
+                paquetes_colocados.append(
+                    (*posicion, *dimensiones, id_rot)
+                )
+                rejilla.ocupar(posicion, dimensiones)
+                colocado = True
+                break
+        return colocado
+
     @abstractmethod
-    def _first_fit(self, colocado, dimensiones_contenedor, paquetes_colocados, paso_rejilla, rotaciones):
+    def _first_fit(self, colocado, dimensiones_contenedor, paquetes_colocados, paso_rejilla, rotaciones, estado=None):
         pass
 
     @abstractmethod
@@ -212,10 +645,14 @@ class OptimizadorEmpaquetadoMultiContenedor(ABC):
         self.prob_mutacion = 0.021
         return (individuo,)
 
+    def _evaluar_aptitud_cacheada(self, individuo) -> tuple[float]:
+        """Consulta la caché de aptitudes antes de colocar los paquetes del individuo"""
+        return self.cache_aptitud.obtener(tuple(individuo), lambda: self._evaluar_aptitud(individuo))
+
     def _evaluar_aptitud(self, individuo) -> tuple[float]:
         """Evalúa la aptitud de un individuo con múltiples contenedores"""
         genes_por_contenedor = 1 + self.num_tipos_paquetes
-        cantidad_total = {tipo.nombre: 0 for tipo in self.tipos_paquetes}
+        cantidad_total = np.zeros(self.num_tipos_paquetes, dtype=np.int64)
         volumen_total_utilizado = 0
         volumen_total_contenedores = 0
         contenedores_usados = 0
@@ -228,11 +665,18 @@ class OptimizadorEmpaquetadoMultiContenedor(ABC):
             if usar_contenedor == 1:
                 contenedores_usados += 1
                 genes_contenedor = individuo[inicio:inicio + genes_por_contenedor]
-                paquetes_colocados, dimensiones_contenedor = self._colocar_paquetes_en_contenedor(genes_contenedor, i)
-
-                # Actualizar conteo total de paquetes realmente colocados
-                volumen_contenedor, volumen_utilizado = self._conteo_paquetes(cantidad_total, dimensiones_contenedor,
-                                                                              paquetes_colocados)
+                if self.representacion_compacta and self.cache_colocacion is not None:
+                    # Se cuenta sobre los registros de la caché sin reconstruir las tuplas
+                    registros = self._colocar_registros(genes_contenedor, i)
+                    volumen_contenedor, volumen_utilizado = self._conteo_registros(
+                        cantidad_total, self.requisitos_contenedores[i].dimensiones, registros)
+                else:
+                    paquetes_colocados, dimensiones_contenedor = self._colocar_paquetes_cacheado(genes_contenedor, i)
+
+                    # Actualizar conteo total de paquetes realmente colocados
+                    volumen_contenedor, volumen_utilizado = self._conteo_paquetes(cantidad_total,
+                                                                                  dimensiones_contenedor,
+                                                                                  paquetes_colocados)
 
                 volumen_total_contenedores += volumen_contenedor
                 volumen_total_utilizado += volumen_utilizado
@@ -243,10 +687,10 @@ class OptimizadorEmpaquetadoMultiContenedor(ABC):
 
         # Verificar restricciones de cantidad mínima
         penalizacion = 1.0
-        for tipo_paquete in self.tipos_paquetes:
-            if cantidad_total[tipo_paquete.nombre] < tipo_paquete.cantidad_minima:
+        for j, tipo_paquete in enumerate(self.tipos_paquetes):
+            if cantidad_total[j] < tipo_paquete.cantidad_minima:
                 penalizacion *= 0.6
-            if cantidad_total[tipo_paquete.nombre] > tipo_paquete.cantidad_maxima:
+            if cantidad_total[j] > tipo_paquete.cantidad_maxima:
                 penalizacion *= 0.6
 
         # La aptitud es el porcentaje de volumen utilizado multiplicado por la penalización
@@ -281,9 +725,13 @@ class OptimizadorEmpaquetadoMultiContenedor(ABC):
             # Solo procesar paquetes si el contenedor está en uso
             if usar_contenedor:
                 genes_contenedor = individuo[inicio:inicio + genes_por_contenedor]
-                paquetes_colocados, _ = self._colocar_paquetes_en_contenedor(genes_contenedor, i)
-
-                self._contenedor_info(contenedor_info, paquetes_colocados)
+                if self.representacion_compacta:
+                    registros = self._colocar_registros(genes_contenedor, i)
+                    contenedor_info['paquetes'] = registros_a_diccionarios(registros, self.nombres_rotacion,
+                                                                           self.tipo_rotacion)
+                else:
+                    paquetes_colocados, _ = self._colocar_paquetes_cacheado(genes_contenedor, i)
+                    self._contenedor_info(contenedor_info, paquetes_colocados)
 
             resultados['contenedores'].append(contenedor_info)
 
@@ -294,6 +742,9 @@ class OptimizadorEmpaquetadoMultiContenedor(ABC):
         pass
 
     def graficar_estadisticas(self) -> None:
+        # matplotlib se importa solo al graficar para que el optimizador no lo cargue
+        from matplotlib import pyplot as plt
+
         # Extraer generaciones y valores
         logbook = self.logbook
         gen = logbook.select("gen")
@@ -340,7 +791,8 @@ class OptimizadorEmpaquetadoMultiContenedor(ABC):
             }
         }
 
-        # Inicializar conteo de paquetes por tipo
+        # Conteo global por índice de tipo; los nombres repetidos se suman en el resumen por nombre
+        conteo_global = np.zeros(self.num_tipos_paquetes, dtype=np.int64)
         for tipo in self.tipos_paquetes:
             analisis['metricas_globales']['paquetes_por_tipo'][tipo.nombre] = 0
 
@@ -350,15 +802,14 @@ class OptimizadorEmpaquetadoMultiContenedor(ABC):
             volumen_utilizado = sum(np.prod(paq['dimensiones']) for paq in contenedor['paquetes'])
 
             # Contar paquetes por tipo en este contenedor
+            conteo = np.bincount([paq['id_tipo'] for paq in contenedor['paquetes']],
+                                 minlength=self.num_tipos_paquetes)
+            conteo_global += conteo
             paquetes_por_tipo = {}
-            for tipo in self.tipos_paquetes:
-                # Contar paquetes cuyo nombre original coincide con el tipo
-                paquetes_por_tipo[tipo.nombre] = sum(
-                    1 for paq in contenedor['paquetes']
-                    if paq['tipo'].split('_')[0] == tipo.nombre
-                )
+            for j, tipo in enumerate(self.tipos_paquetes):
+                paquetes_por_tipo[tipo.nombre] = paquetes_por_tipo.get(tipo.nombre, 0) + int(conteo[j])
                 # Actualizar el conteo global
-                analisis['metricas_globales']['paquetes_por_tipo'][tipo.nombre] += paquetes_por_tipo[tipo.nombre]
+                analisis['metricas_globales']['paquetes_por_tipo'][tipo.nombre] += int(conteo[j])
 
             # Métricas del contenedor
             metricas_contenedor = {
@@ -387,12 +838,12 @@ class OptimizadorEmpaquetadoMultiContenedor(ABC):
         # Verificar cumplimiento de restricciones
         analisis['cumplimiento_restricciones'] = {
             'cantidad_minima_cumplida': all(
-                analisis['metricas_globales']['paquetes_por_tipo'][tipo.nombre] >= tipo.cantidad_minima
-                for tipo in self.tipos_paquetes
+                conteo_global[j] >= tipo.cantidad_minima
+                for j, tipo in enumerate(self.tipos_paquetes)
             ),
             'cantidad_maxima_cumplida': all(
-                analisis['metricas_globales']['paquetes_por_tipo'][tipo.nombre] <= tipo.cantidad_maxima
-                for tipo in self.tipos_paquetes
+                conteo_global[j] <= tipo.cantidad_maxima
+                for j, tipo in enumerate(self.tipos_paquetes)
             )
         }
 
@@ -0,0 +1,65 @@
+"""
+    Caché LRU acotada para reutilizar resultados del modelo que
+    dependen solo de los genes (aptitudes, colocaciones)
+"""
+from collections import OrderedDict
+
+
+class CacheLRU:
+    """
+    Caché acotada que descarta primero las entradas usadas hace más tiempo.
+    Además del número de entradas puede limitar un peso total, medido con
+    la función peso sobre cada valor (por ejemplo, paquetes colocados)
+    """
+
+    def __init__(self, tamano_maximo: int, peso_maximo: int = None, peso=None) -> None:
+        self.tamano_maximo = tamano_maximo
+        self.peso_maximo = peso_maximo
+        self.peso = peso
+        self.peso_total = 0
+        self.entradas = OrderedDict()
+        self.aciertos = 0
+        self.fallos = 0
+
+    def obtener(self, clave, calcular):
+        """Devuelve el valor guardado para la clave o lo calcula y lo guarda"""
+        valor = self.consultar(clave)
+        if valor is None:
+            valor = calcular()
+            self.guardar(clave, valor)
+        return valor
+
+    def consultar(self, clave):
+        """Devuelve el valor guardado para la clave, o None si no está, y lo cuenta como acierto o fallo"""
+        if clave in self.entradas:
+            self.aciertos += 1
+            self.entradas.move_to_end(clave)
+            return self.entradas[clave]
+        self.fallos += 1
+        return None
+
+    def guardar(self, clave, valor) -> None:
+        """Guarda un valor calculado y descarta las entradas más antiguas si hace falta"""
+        self.entradas[clave] = valor
+        if self.peso is not None:
+            self.peso_total += self.peso(valor)
+        self._descartar_antiguas()
+
+    def _descartar_antiguas(self) -> None:
+        """Elimina las entradas menos recientes hasta respetar los límites"""
+        while self.entradas and (
+                len(self.entradas) > self.tamano_maximo or
+                (self.peso_maximo is not None and self.peso_total > self.peso_maximo)):
+            _, valor = self.entradas.popitem(last=False)
+            if self.peso is not None:
+                self.peso_total -= self.peso(valor)
+
+    def tomar_contadores(self) -> tuple[int, int]:
+        """Devuelve los aciertos y fallos acumulados y reinicia los contadores"""
+        contadores = (self.aciertos, self.fallos)
+        self.aciertos = 0
+        self.fallos = 0
+        return contadores
+
+    def __len__(self) -> int:
+        return len(self.entradas)
@@ -0,0 +1,38 @@
+"""
+    Representación compacta de las colocaciones: un arreglo estructurado
+    de NumPy por contenedor con enteros de 32 bits para posición y
+    dimensiones y el índice de la rotación en lugar de su nombre
+"""
+import numpy as np
+
+
+def dtype_registro(ejes: int) -> np.dtype:
+    """Tipo estructurado de un paquete colocado en un contenedor de 1, 2 o 3 ejes"""
+    return np.dtype([
+        ('posicion', np.int32, (ejes,)),
+        ('dimensiones', np.int32, (ejes,)),
+        ('rotacion', np.int16),
+    ])
+
+
+def comprimir_colocacion(paquetes_colocados: list, ejes: int) -> np.ndarray:
+    """Convierte las tuplas (x..., l..., id_rotacion) en un arreglo estructurado"""
+    registros = np.empty(len(paquetes_colocados), dtype=dtype_registro(ejes))
+    for i, paq in enumerate(paquetes_colocados):
+        registros[i] = (paq[:ejes], paq[ejes:2 * ejes], paq[2 * ejes])
+    return registros
+
+
+def registros_a_diccionarios(registros: np.ndarray, nombres_rotacion: list, tipo_rotacion) -> list[dict]:
+    """Convierte los registros al formato de 'paquetes' del diccionario de resultados"""
+    return [
+        {
+            'tipo': nombres_rotacion[rotacion],
+            'id_tipo': int(tipo_rotacion[rotacion]),
+            'posicion': tuple(posicion),
+            'dimensiones': tuple(dimensiones)
+        }
+        for posicion, dimensiones, rotacion in zip(registros['posicion'].tolist(),
+                                                   registros['dimensiones'].tolist(),
+                                                   registros['rotacion'].tolist())
+    ]
@@ -0,0 +1,34 @@
+"""
+    Índice espacial de los paquetes colocados: el contenedor se divide
+    en cubetas uniformes y cada paquete se registra en las cubetas que
+    toca, así una prueba de colisión solo revisa los paquetes cercanos
+"""
+from itertools import product
+
+
+class IndiceEspacial:
+    """Cubetas uniformes (2D o 3D) con los paquetes colocados que tocan cada celda"""
+
+    def __init__(self, tamano_celda: tuple) -> None:
+        self.tamano_celda = tamano_celda
+        self.num_ejes = len(tamano_celda)
+        self.cubetas = {}
+
+    def _celdas(self, posicion: tuple, dimensiones: tuple):
+        """Celdas del índice que toca la caja posicion + dimensiones"""
+        return product(*(
+            range(p // t, (p + d - 1) // t + 1)
+            for p, d, t in zip(posicion, dimensiones, self.tamano_celda)
+        ))
+
+    def agregar(self, paquete: tuple) -> None:
+        """Registra un paquete colocado (x, y[, z], l, a[, h], nombre)"""
+        posicion = paquete[:self.num_ejes]
+        dimensiones = paquete[self.num_ejes:2 * self.num_ejes]
+        for celda in self._celdas(posicion, dimensiones):
+            self.cubetas.setdefault(celda, []).append(paquete)
+
+    def cercanos(self, posicion: tuple, dimensiones: tuple):
+        """Paquetes registrados en las celdas que toca la caja (puede repetir paquetes)"""
+        for celda in self._celdas(posicion, dimensiones):
+            yield from self.cubetas.get(celda, ())
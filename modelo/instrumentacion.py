@@ -0,0 +1,51 @@
+"""
+    Instrumentación opcional del bucle de generaciones: segundos y
+    número de llamadas por fase, acumulados por generación para
+    guardarlos como columnas del logbook
+"""
+import time
+
+# Las fases se anidan: evaluacion incluye first_fit, y first_fit incluye puede_colocar
+FASES = ('variacion', 'evaluacion', 'first_fit', 'puede_colocar', 'seleccion', 'estadisticas')
+
+
+def columnas_instrumentacion() -> tuple[str, ...]:
+    """Columnas del logbook: t_<fase> en segundos y n_<fase> en llamadas"""
+    return tuple(f"{prefijo}_{fase}" for fase in FASES for prefijo in ('t', 'n'))
+
+
+class Instrumentacion:
+    """Acumula el tiempo y las llamadas de cada fase hasta que se toman al cerrar la generación"""
+
+    def __init__(self) -> None:
+        self.segundos = dict.fromkeys(FASES, 0.0)
+        self.llamadas = dict.fromkeys(FASES, 0)
+
+    def sumar(self, fase: str, segundos: float, llamadas: int = 1) -> None:
+        self.segundos[fase] += segundos
+        self.llamadas[fase] += llamadas
+
+    def envolver(self, fase: str, funcion):
+        """Devuelve funcion medida; solo se usa con la instrumentación activa"""
+        segundos = self.segundos
+        llamadas = self.llamadas
+        reloj = time.perf_counter
+
+        def medida(*argumentos):
+            inicio = reloj()
+            try:
+                return funcion(*argumentos)
+            finally:
+                segundos[fase] += reloj() - inicio
+                llamadas[fase] += 1
+        return medida
+
+    def tomar(self) -> dict:
+        """Devuelve las columnas acumuladas desde la última vez y reinicia los contadores"""
+        columnas = {}
+        for fase in FASES:
+            columnas[f"t_{fase}"] = self.segundos[fase]
+            columnas[f"n_{fase}"] = self.llamadas[fase]
+            self.segundos[fase] = 0.0
+            self.llamadas[fase] = 0
+        return columnas
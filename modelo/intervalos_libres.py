@@ -0,0 +1,34 @@
+"""
+    Intervalos libres para la colocación 1D: los huecos del contenedor
+    se guardan ordenados por su inicio para encontrar y partir el hueco
+    de cada paquete sin recorrer la longitud completa
+"""
+from bisect import bisect_right
+
+
+class IntervalosLibres:
+    """Intervalos libres [inicio, fin) de un contenedor 1D ordenados por inicio"""
+
+    def __init__(self, dimensiones_contenedor: tuple) -> None:
+        self.inicios = [0]
+        self.finales = [dimensiones_contenedor[0]]
+
+    def buscar_posicion(self, l: int):
+        """Devuelve el menor x donde cabe un paquete de longitud l, o None"""
+        for inicio, fin in zip(self.inicios, self.finales):
+            if fin - inicio >= l:
+                return inicio
+        return None
+
+    def ocupar(self, x: int, l: int) -> None:
+        """Parte el intervalo libre que contiene [x, x + l)"""
+        i = bisect_right(self.inicios, x) - 1
+        inicio, fin = self.inicios[i], self.finales[i]
+        del self.inicios[i], self.finales[i]
+
+        if x + l < fin:
+            self.inicios.insert(i, x + l)
+            self.finales.insert(i, fin)
+        if inicio < x:
+            self.inicios.insert(i, inicio)
+            self.finales.insert(i, x)
@@ -0,0 +1,131 @@
+"""
+    Modelo de islas: varias poblaciones evolucionan en procesos separados
+    con el mismo toolbox y cada cierto número de generaciones envían sus
+    mejores individuos a otra isla según una topología en anillo o aleatoria
+"""
+import multiprocessing
+import random
+import traceback
+
+from deap import tools
+
+TOPOLOGIAS = ('anillo', 'aleatoria')
+
+
+def _ejecutar_isla(optimizador, semilla: int, conexion) -> None:
+    """
+    Bucle de un proceso isla: recibe (generaciones, inmigrantes), integra los
+    inmigrantes, evoluciona esas generaciones y responde con sus emigrantes
+    """
+    try:
+        random.seed(semilla)
+        # Cada isla ya ocupa un proceso: la evaluación dentro de ella es en serie
+        optimizador.trabajadores = 1
+        poblacion = optimizador.toolbox.population(n=optimizador.tamano_poblacion)
+        mejor_individuo = None
+        mejor_aptitud = 0.0
+
+        while True:
+            orden = conexion.recv()
+            if orden is None:
+                break
+            generaciones, inmigrantes, num_migrantes = orden
+
+            # Los inmigrantes sustituyen a los peores individuos de la población
+            if inmigrantes:
+                peores = sorted(range(len(poblacion)), key=lambda i: poblacion[i].fitness.values[0])
+                for indice, (genes, aptitud) in zip(peores, inmigrantes):
+                    individuo = optimizador._crear_individuo(genes)
+                    individuo.fitness.values = aptitud
+                    poblacion[indice] = individuo
+
+            registros = []
+            for _ in range(generaciones):
+                poblacion, descendencia, _ = optimizador._paso_generacion(poblacion)
+                for ind in descendencia:
+                    if ind.fitness.values[0] > mejor_aptitud:
+                        mejor_aptitud = ind.fitness.values[0]
+                        mejor_individuo = list(ind)
+                registros.append(optimizador.stats.compile(poblacion))
+
+            emigrantes = [(list(ind), ind.fitness.values) for ind in tools.selBest(poblacion, num_migrantes)]
+            conexion.send(('ok', registros, emigrantes, mejor_aptitud, mejor_individuo))
+    except Exception:
+        conexion.send(('error', traceback.format_exc()))
+    finally:
+        conexion.close()
+
+
+class ModeloIslas:
+    """Coordina los procesos isla: reparte las generaciones por épocas y enruta las migraciones"""
+
+    def __init__(self, optimizador, num_islas: int, intervalo_migracion: int, num_migrantes: int,
+                 topologia: str = 'anillo', semilla: int = None) -> None:
+        if topologia not in TOPOLOGIAS:
+            raise ValueError(f"Topología de migración desconocida: {topologia}")
+        if num_islas < 1 or intervalo_migracion < 1:
+            raise ValueError("num_islas e intervalo_migracion deben ser al menos 1")
+        self.optimizador = optimizador
+        self.num_islas = num_islas
+        self.intervalo_migracion = intervalo_migracion
+        self.num_migrantes = num_migrantes
+        self.topologia = topologia
+        # Generador propio para las semillas de las islas y los destinos aleatorios
+        self.aleatorio = random.Random(semilla)
+
+    def destinos(self) -> list[int]:
+        """Isla a la que envía sus emigrantes cada isla en esta migración"""
+        if self.num_islas == 1:
+            return [0]
+        if self.topologia == 'anillo':
+            return [(i + 1) % self.num_islas for i in range(self.num_islas)]
+        return [self.aleatorio.choice([j for j in range(self.num_islas) if j != i]) for i in range(self.num_islas)]
+
+    def ejecutar(self, generaciones: int):
+        """
+        Generador que entrega, al final de cada época, la lista de respuestas de
+        las islas (registros por generación, mejor aptitud y mejor individuo)
+        """
+        conexiones = []
+        procesos = []
+        for _ in range(self.num_islas):
+            propia, hija = multiprocessing.Pipe()
+            proceso = multiprocessing.Process(
+                target=_ejecutar_isla,
+                args=(self.optimizador, self.aleatorio.randrange(2 ** 32), hija)
+            )
+            proceso.start()
+            hija.close()
+            conexiones.append(propia)
+            procesos.append(proceso)
+
+        try:
+            inmigrantes = [[] for _ in range(self.num_islas)]
+            restantes = generaciones
+            while restantes > 0:
+                epoca = min(self.intervalo_migracion, restantes)
+                for conexion, entrantes in zip(conexiones, inmigrantes):
+                    conexion.send((epoca, entrantes, self.num_migrantes))
+                respuestas = [conexion.recv() for conexion in conexiones]
+                for respuesta in respuestas:
+                    if respuesta[0] == 'error':
+                        raise RuntimeError(f"Falló un proceso isla:\n{respuesta[1]}")
+                restantes -= epoca
+
+                yield [
+                    {'registros': registros, 'mejor_aptitud': aptitud, 'mejor_individuo': individuo}
+                    for _, registros, _, aptitud, individuo in respuestas
+                ]
+
+                inmigrantes = [[] for _ in range(self.num_islas)]
+                for origen, destino in enumerate(self.destinos()):
+                    inmigrantes[destino].extend(respuestas[origen][2])
+        finally:
+            for conexion in conexiones:
+                try:
+                    conexion.send(None)
+                except (BrokenPipeError, OSError):
+                    pass
+                conexion.close()
+            for proceso in procesos:
+                proceso.join()
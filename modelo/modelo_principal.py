@@ -2,6 +2,9 @@ from modelo.datos import RequisitosContenedor, Paquete
 from modelo.bpga_3d import OptimizadorEmpaquetadoMultiContenedor3D
 from modelo.bpga_2d import OptimizadorEmpaquetadoMultiContenedor2D
 from modelo.bpga_1d import OptimizadorEmpaquetadoMultiContenedor1D
+from matplotlib import pyplot as plt
+# Las gráficas de la interfaz se abren en ventanas de Qt; los módulos del optimizador no eligen backend
+plt.switch_backend('Qt5Agg')
 
 class Modelo:
     def __init__(self, control):
@@ -9,7 +12,9 @@ class Modelo:
 
     def optimizar(self,contenedores: list[RequisitosContenedor],paquetes: list[Paquete],rotaciones,
                   poblacion: int,
-                  generaciones: int) -> dict:
+                  generaciones: int,
+                  progreso=None) -> tuple:
+        """Ejecuta la optimización (en el hilo de trabajo) y devuelve el optimizador y su resultado"""
 
         if len(contenedores[0].dimensiones) == 1:
             print(contenedores)
@@ -37,10 +42,11 @@ class Modelo:
                 tamano_poblacion=poblacion,
                 generaciones=generaciones
             )
-        resultado = optimizador.optimizar()
-        optimizador.analizar_resultados(resultado)
+        resultado = optimizador.optimizar(progreso=progreso)
+        return optimizador, resultado
+
+    def mostrar_resultados(self, optimizador, resultado: dict) -> None:
+        """Imprime y grafica un resultado; las ventanas de matplotlib deben abrirse en el hilo de la interfaz"""
         optimizador.imprimir_resultados(resultado, optimizador.analizar_resultados(resultado))
         optimizador.graficar_estadisticas()
         optimizador.graficar_resultados(resultado)
-        self.control.listo()
-
@@ -0,0 +1,78 @@
+"""
+    Evaluación de aptitudes en un grupo de procesos: cada trabajador
+    recibe una sola vez una copia del optimizador al arrancar y después
+    solo se le envían los genes de los individuos
+"""
+import multiprocessing
+from functools import partial
+
+# Copia del optimizador dentro de cada proceso trabajador
+_optimizador = None
+
+
+def _inicializar_trabajador(optimizador) -> None:
+    global _optimizador
+    _optimizador = optimizador
+
+
+def _llamar_en_trabajador(nombre_metodo: str, genes: tuple):
+    """Resultado del método y los atajos de colocación que contó el trabajador para sumarlos al logbook"""
+    return getattr(_optimizador, nombre_metodo)(genes), tuple(_optimizador._tomar_atajos().values())
+
+
+class EvaluadorParalelo:
+    """Sustituto de toolbox.map que reparte las evaluaciones entre procesos"""
+
+    def __init__(self, optimizador, trabajadores: int, tamano_lote: int = None) -> None:
+        self.optimizador = optimizador
+        self.tamano_lote = tamano_lote
+        self.grupo = multiprocessing.Pool(
+            trabajadores,
+            initializer=_inicializar_trabajador,
+            initargs=(optimizador,)
+        )
+
+    def map(self, funcion, individuos) -> list:
+        """Aplica funcion a los individuos; los métodos del optimizador se ejecutan en los trabajadores"""
+        # toolbox.register envuelve las funciones en un partial sin argumentos
+        if isinstance(funcion, partial) and not funcion.args and not funcion.keywords:
+            funcion = funcion.func
+        nombre_metodo = getattr(funcion, '__name__', None)
+        if getattr(funcion, '__self__', None) is not self.optimizador:
+            return list(map(funcion, individuos))
+
+        # La caché de aptitudes se consulta aquí para que los aciertos cuenten en el logbook
+        cache = self.optimizador.cache_aptitud
+        if nombre_metodo == '_evaluar_aptitud_cacheada' and cache is not None:
+            genes = [tuple(ind) for ind in individuos]
+            resultados = []
+            pendientes = {}
+            for g in genes:
+                if g in pendientes:
+                    # Repetido en el mismo lote: en serie habría sido un acierto
+                    cache.aciertos += 1
+                    resultados.append(None)
+                else:
+                    resultados.append(cache.consultar(g))
+                    if resultados[-1] is None:
+                        pendientes[g] = None
+            for g, aptitud in zip(pendientes, self._repartir('_evaluar_aptitud', list(pendientes))):
+                pendientes[g] = aptitud
+                cache.guardar(g, aptitud)
+            return [r if r is not None else pendientes[g] for g, r in zip(genes, resultados)]
+
+        return self._repartir(nombre_metodo, [tuple(ind) for ind in individuos])
+
+    def _repartir(self, nombre_metodo: str, genes: list) -> list:
+        if not genes:
+            return []
+        respuestas = self.grupo.map(partial(_llamar_en_trabajador, nombre_metodo), genes, chunksize=self.tamano_lote)
+        atajos = self.optimizador.atajos
+        for _, contados in respuestas:
+            for clave, cantidad in zip(atajos, contados):
+                atajos[clave] += cantidad
+        return [resultado for resultado, _ in respuestas]
+
+    def cerrar(self) -> None:
+        self.grupo.close()
+        self.grupo.join()
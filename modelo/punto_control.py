@@ -0,0 +1,85 @@
+"""
+    Puntos de control de la optimización: población como matriz de
+    enteros, aptitudes, logbook, mejor individuo, estado de random y
+    probabilidad de mutación vigente, comprimidos y escritos de forma
+    atómica en un hilo aparte
+"""
+import gzip
+import os
+import pickle
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+VERSION_PUNTO_CONTROL = 2
+
+
+def capturar_estado(gen: int, poblacion: list, logbook, mejor_individuo, mejor_aptitud: float,
+                    estado_random: tuple, prob_mutacion: float) -> dict:
+    """Copia del estado tras la generación gen que no cambia aunque la optimización continúe"""
+    return {
+        'version': VERSION_PUNTO_CONTROL,
+        'gen': gen,
+        'genes': np.array([list(ind) for ind in poblacion], dtype=np.int32),
+        'aptitudes': np.array([ind.fitness.values[0] for ind in poblacion], dtype=np.float64),
+        # Las filas del logbook no se modifican después de registrarse: basta con copiar la lista
+        'logbook': (tuple(logbook.header), list(logbook)),
+        'mejor_individuo': None if mejor_individuo is None else list(mejor_individuo),
+        'mejor_aptitud': mejor_aptitud,
+        'random': estado_random,
+        # _mutar puede cambiar la probabilidad de mutación durante la ejecución
+        'prob_mutacion': prob_mutacion,
+    }
+
+
+def guardar_punto_control(ruta: str, estado: dict) -> None:
+    """Escribe el estado en un archivo temporal de la misma carpeta y lo renombra sobre ruta"""
+    carpeta = os.path.dirname(os.path.abspath(ruta))
+    descriptor, temporal = tempfile.mkstemp(dir=carpeta, prefix='.punto_control_')
+    try:
+        with os.fdopen(descriptor, 'wb') as archivo:
+            with gzip.GzipFile(fileobj=archivo, mode='wb', compresslevel=1) as comprimido:
+                pickle.dump(estado, comprimido, protocol=pickle.HIGHEST_PROTOCOL)
+            archivo.flush()
+            os.fsync(archivo.fileno())
+        os.replace(temporal, ruta)
+    except BaseException:
+        os.unlink(temporal)
+        raise
+
+
+def cargar_punto_control(ruta: str) -> dict:
+    with gzip.open(ruta, 'rb') as archivo:
+        estado = pickle.load(archivo)
+    if estado.get('version') != VERSION_PUNTO_CONTROL:
+        raise ValueError(f"Versión de punto de control no soportada: {estado.get('version')}")
+    return estado
+
+
+class EscritorPuntosControl:
+    """Escribe los puntos de control en un hilo para no detener el bucle de generaciones"""
+
+    def __init__(self, ruta: str) -> None:
+        self.ruta = ruta
+        # Un solo hilo: las escrituras terminan en el mismo orden en que se piden
+        self.hilo = ThreadPoolExecutor(max_workers=1)
+        self.pendiente = None
+
+    def guardar(self, estado: dict) -> None:
+        # Un error de la escritura anterior se propaga aquí en lugar de perderse
+        if self.pendiente is not None and self.pendiente.done():
+            self.pendiente.result()
+        self.pendiente = self.hilo.submit(guardar_punto_control, self.ruta, estado)
+
+    def cerrar(self) -> None:
+        """Espera a que termine la última escritura"""
+        self.hilo.shutdown(wait=True)
+        if self.pendiente is not None:
+            self.pendiente.result()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion) -> None:
+        self.cerrar()
@@ -0,0 +1,67 @@
+"""
+    Puntos extremos para la colocación 3D: en lugar de recorrer
+    todas las celdas del contenedor solo se prueban las esquinas
+    que generan los paquetes ya colocados
+"""
+from modelo.indice_espacial import IndiceEspacial
+
+
+class PuntosExtremos3D:
+    """Conjunto ordenado de puntos extremos candidatos de un contenedor 3D"""
+
+    def __init__(self, dimensiones_contenedor: tuple, indice: IndiceEspacial = None) -> None:
+        self.dimensiones_contenedor = dimensiones_contenedor
+        self.puntos = [(0, 0, 0)]
+        # Índice espacial opcional para las pruebas de colisión en los puntos
+        self.indice = indice
+
+    def candidatos(self) -> list[tuple]:
+        """Puntos ordenados como los recorre la rejilla (x, luego y, luego z)"""
+        return self.puntos
+
+    def agregar_paquete(self, paquetes_colocados: list) -> None:
+        """Actualiza los puntos tras añadir el último paquete de la lista"""
+        x, y, z, l, a, h, _ = paquetes_colocados[-1]
+        largo, ancho, alto = self.dimensiones_contenedor
+        if self.indice is not None:
+            self.indice.agregar(paquetes_colocados[-1])
+
+        # Las tres esquinas del paquete y sus proyecciones hacia los ejes
+        nuevos = {
+            (x + l, y, z), (x, y + a, z), (x, y, z + h),
+            (x + l, self._proyectar(paquetes_colocados, (x + l, y, z), 1), z),
+            (x + l, y, self._proyectar(paquetes_colocados, (x + l, y, z), 2)),
+            (self._proyectar(paquetes_colocados, (x, y + a, z), 0), y + a, z),
+            (x, y + a, self._proyectar(paquetes_colocados, (x, y + a, z), 2)),
+            (self._proyectar(paquetes_colocados, (x, y, z + h), 0), y, z + h),
+            (x, self._proyectar(paquetes_colocados, (x, y, z + h), 1), z + h),
+        }
+
+        # Descartar puntos fuera del contenedor o cubiertos por el nuevo paquete
+        puntos = set(self.puntos) | nuevos
+        self.puntos = sorted(
+            p for p in puntos
+            if p[0] < largo and p[1] < ancho and p[2] < alto
+            and not (x <= p[0] < x + l and y <= p[1] < y + a and z <= p[2] < z + h)
+        )
+
+    def _proyectar(self, paquetes_colocados: list, punto: tuple, eje: int) -> int:
+        """Desplaza el punto hacia el origen sobre un eje hasta tocar un paquete o la pared"""
+        if punto[eje] == 0:
+            return 0
+
+        # Con índice espacial solo se revisan los paquetes de la columna de celdas que recorre el punto
+        if self.indice is not None:
+            origen = tuple(0 if e == eje else punto[e] for e in range(3))
+            recorrido = tuple(punto[eje] if e == eje else 1 for e in range(3))
+            paquetes_colocados = self.indice.cercanos(origen, recorrido)
+
+        otros = [e for e in range(3) if e != eje]
+        limite = 0
+        for paq in paquetes_colocados:
+            posicion, dimensiones = paq[0:3], paq[3:6]
+            fin = posicion[eje] + dimensiones[eje]
+            if limite < fin <= punto[eje] and all(
+                    posicion[e] <= punto[e] < posicion[e] + dimensiones[e] for e in otros):
+                limite = fin
+        return limite
@@ -0,0 +1,56 @@
+"""
+    Rectángulos libres maximales para la colocación 2D: el espacio
+    libre del contenedor se describe con los rectángulos libres más
+    grandes posibles y solo se prueban sus esquinas inferiores izquierdas
+"""
+
+
+class RectangulosLibres:
+    """Conjunto de rectángulos libres maximales (x, y, largo, ancho) de un contenedor 2D"""
+
+    def __init__(self, dimensiones_contenedor: tuple) -> None:
+        self.dimensiones_contenedor = dimensiones_contenedor
+        self.rectangulos = [(0, 0, dimensiones_contenedor[0], dimensiones_contenedor[1])]
+
+    def buscar_posicion(self, l: int, a: int):
+        """
+        Devuelve la posición mínima en (x, y) donde cabe un paquete de l x a,
+        la misma que encontraría el recorrido completo de la rejilla, o None
+        """
+        mejor = None
+        for rx, ry, rl, ra in self.rectangulos:
+            if l <= rl and a <= ra and (mejor is None or (rx, ry) < mejor):
+                mejor = (rx, ry)
+        return mejor
+
+    def ocupar(self, x: int, y: int, l: int, a: int) -> None:
+        """Divide los rectángulos libres que intersectan el paquete colocado"""
+        nuevos = []
+        for rect in self.rectangulos:
+            rx, ry, rl, ra = rect
+            if x >= rx + rl or x + l <= rx or y >= ry + ra or y + a <= ry:
+                nuevos.append(rect)
+                continue
+
+            # Partes del rectángulo que quedan libres a cada lado del paquete
+            if x > rx:
+                nuevos.append((rx, ry, x - rx, ra))
+            if x + l < rx + rl:
+                nuevos.append((x + l, ry, rx + rl - x - l, ra))
+            if y > ry:
+                nuevos.append((rx, ry, rl, y - ry))
+            if y + a < ry + ra:
+                nuevos.append((rx, y + a, rl, ry + ra - y - a))
+
+        self.rectangulos = self._eliminar_contenidos(nuevos)
+
+    @staticmethod
+    def _eliminar_contenidos(rectangulos: list[tuple]) -> list[tuple]:
+        """Quita los rectángulos contenidos en otro para conservar solo los maximales"""
+        rectangulos = sorted(set(rectangulos), key=lambda r: r[2] * r[3], reverse=True)
+        maximales = []
+        for rx, ry, rl, ra in rectangulos:
+            if not any(mx <= rx and my <= ry and rx + rl <= mx + ml and ry + ra <= my + ma
+                       for mx, my, ml, ma in maximales):
+                maximales.append((rx, ry, rl, ra))
+        return maximales
@@ -0,0 +1,90 @@
+"""
+    Reinicios con varias semillas en paralelo: cada semilla es una
+    optimización independiente y todas comparten un presupuesto de
+    tiempo o de evaluaciones y una señal de cancelación
+"""
+import io
+import multiprocessing
+import time
+from contextlib import closing, redirect_stdout
+
+# Estado compartido dentro de cada proceso trabajador
+_optimizador = None
+_cancelar = None
+_evaluaciones = None
+_limites = None
+
+
+def _inicializar_trabajador(optimizador, cancelar, evaluaciones, limites: dict) -> None:
+    global _optimizador, _cancelar, _evaluaciones, _limites
+    _optimizador = optimizador
+    # Los trabajadores del grupo no pueden crear procesos: cada semilla se evalúa en serie
+    _optimizador.trabajadores = 1
+    _cancelar = cancelar
+    _evaluaciones = evaluaciones
+    _limites = limites
+
+
+def _presupuesto_agotado() -> bool:
+    if _limites['fin'] is not None and time.time() >= _limites['fin']:
+        return True
+    return _limites['evaluaciones'] is not None and _evaluaciones.value >= _limites['evaluaciones']
+
+
+def _ejecutar_semilla(semilla: int) -> dict:
+    """Optimiza con una semilla hasta terminar, agotar el presupuesto o recibir la cancelación"""
+    inicio = time.perf_counter()
+    resumen = {'semilla': semilla, 'estado': 'completa', 'aptitud': 0.0, 'individuo': None,
+               'generaciones': 0, 'evaluaciones': 0, 'segundos': 0.0}
+    # El presupuesto solo descarta semillas cuando ya hay alguna generación completa
+    if _cancelar.is_set() or (_evaluaciones.value > 0 and _presupuesto_agotado()):
+        resumen['estado'] = 'cancelada'
+        return resumen
+
+    # iterar_generaciones restaura prob_mutacion y el logbook: la semilla no depende de las que
+    # atendió antes este proceso. Las estadísticas se mezclarían en la consola: se descartan
+    with closing(_optimizador.iterar_generaciones(semilla)) as generaciones, redirect_stdout(io.StringIO()):
+        for registro in generaciones:
+            resumen['generaciones'] += 1
+            resumen['evaluaciones'] += registro['evaluaciones']
+            resumen['aptitud'] = registro['mejor_aptitud']
+            resumen['individuo'] = registro['mejor_individuo']
+            with _evaluaciones.get_lock():
+                _evaluaciones.value += registro['evaluaciones']
+
+            if _limites['objetivo'] is not None and registro['mejor_aptitud'] >= _limites['objetivo']:
+                resumen['estado'] = 'objetivo'
+                _cancelar.set()
+                break
+            if _cancelar.is_set():
+                resumen['estado'] = 'cancelada'
+                break
+            if _presupuesto_agotado():
+                resumen['estado'] = 'presupuesto'
+                break
+
+    resumen['segundos'] = time.perf_counter() - inicio
+    if resumen['individuo'] is not None:
+        resumen['individuo'] = list(resumen['individuo'])
+    return resumen
+
+
+def ejecutar_reinicios(optimizador, semillas: list[int], procesos: int = None, tiempo_maximo: float = None,
+                       evaluaciones_maximas: int = None, aptitud_objetivo: float = None) -> list[dict]:
+    """
+    Ejecuta una optimización por semilla en un grupo de procesos y devuelve el resumen
+    de cada una (semilla, estado, aptitud, individuo, generaciones, evaluaciones, segundos).
+    Las semillas se detienen al agotar entre todas tiempo_maximo segundos o
+    evaluaciones_maximas evaluaciones, y la primera que alcanza aptitud_objetivo cancela el resto
+    """
+    cancelar = multiprocessing.Event()
+    evaluaciones = multiprocessing.Value('q', 0)
+    limites = {
+        'fin': None if tiempo_maximo is None else time.time() + tiempo_maximo,
+        'evaluaciones': evaluaciones_maximas,
+        'objetivo': aptitud_objetivo,
+    }
+    with multiprocessing.Pool(procesos, initializer=_inicializar_trabajador,
+                              initargs=(optimizador, cancelar, evaluaciones, limites)) as grupo:
+        # chunksize=1: cada semilla se reparte por separado para que la cancelación llegue pronto
+        return grupo.map(_ejecutar_semilla, semillas, chunksize=1)
@@ -0,0 +1,112 @@
+"""
+    Estructuras de NumPy para el motor 'ocupacion_numpy': en 2D una rejilla
+    con las celdas libres consecutivas de cada columna, en 3D un mapa de
+    alturas. Ambas se actualizan solo en la zona del paquete colocado y
+    buscan la primera posición factible por bloques de filas, deteniéndose
+    en el primer bloque que contiene alguna
+"""
+import numpy as np
+
+# Anclas x del primer bloque; cada bloque siguiente dobla el anterior
+BLOQUE_INICIAL = 16
+
+
+def _tipo_entero(maximo: int):
+    return np.uint16 if maximo <= np.iinfo(np.uint16).max else np.int32
+
+
+def _ventana(valores: np.ndarray, ancho: int, operacion) -> np.ndarray:
+    """
+    operacion acumulada sobre cada ventana de ancho filas consecutivas (eje 0),
+    por duplicación del tramo: log2(ancho) pasadas en lugar de ancho
+    """
+    resultado = valores
+    tramo = 1
+    while tramo * 2 <= ancho:
+        resultado = operacion(resultado[:-tramo], resultado[tramo:])
+        tramo *= 2
+    if tramo < ancho:
+        anclas = len(valores) - ancho + 1
+        resultado = operacion(resultado[:anclas], resultado[ancho - tramo:ancho - tramo + anclas])
+    return resultado
+
+
+def _bloques_anclas(limite: int, paso_rejilla: int):
+    """Primer y último ancla (excluido) de cada bloque de anclas 0, paso, 2·paso... hasta limite"""
+    inicio = 0
+    cantidad = BLOQUE_INICIAL
+    while inicio < limite:
+        fin = min(limite, inicio + cantidad * paso_rejilla)
+        yield inicio, fin
+        inicio = fin
+        cantidad *= 2
+
+
+class RejillaOcupacion:
+    """
+    Rejilla 2D donde libres[x, y] es el número de celdas libres consecutivas desde
+    (x, y) hacia arriba: un paquete l x a cabe en (x, y) si las l columnas desde x
+    tienen al menos a celdas libres en y. Da las mismas posiciones que la rejilla de referencia
+    """
+
+    def __init__(self, dimensiones_contenedor: tuple) -> None:
+        largo, ancho = dimensiones_contenedor
+        tipo = _tipo_entero(ancho)
+        self.libres = np.tile(np.arange(ancho, 0, -1, dtype=tipo), (largo, 1))
+
+    def primera_posicion(self, dimensiones: tuple, paso_rejilla: int = 1):
+        """Primera posición factible en el orden de la rejilla (x, luego y), o None"""
+        l, a = dimensiones
+        largo, ancho = self.libres.shape
+        if l > largo or a > ancho:
+            return None
+        columnas = slice(0, ancho - a + 1, paso_rejilla)
+        for inicio, fin in _bloques_anclas(largo - l + 1, paso_rejilla):
+            cabe = self.libres[inicio:fin - 1 + l, columnas] >= a
+            factibles = _ventana(cabe, l, np.logical_and)[::paso_rejilla]
+            if factibles.any():
+                i, j = np.unravel_index(np.argmax(factibles), factibles.shape)
+                return inicio + int(i) * paso_rejilla, int(j) * paso_rejilla
+        return None
+
+    def ocupar(self, posicion: tuple, dimensiones: tuple) -> None:
+        """Marca la caja como ocupada y acorta los huecos de debajo en sus columnas"""
+        (x, y), (l, a) = posicion, dimensiones
+        self.libres[x:x + l, y:y + a] = 0
+        if y:
+            debajo = self.libres[x:x + l, :y]
+            np.minimum(debajo, np.arange(y, 0, -1, dtype=debajo.dtype), out=debajo)
+
+
+class MapaAlturas:
+    """
+    Mapa de alturas 3D: cada columna (x, y) guarda la altura ocupada más alta y
+    un paquete se apoya sobre la columna más alta de su base. Ocupa solo largo x
+    ancho celdas, pero no aprovecha los huecos bajo paquetes que sobresalen,
+    así que puede colocar distinto que la rejilla de referencia
+    """
+
+    def __init__(self, dimensiones_contenedor: tuple) -> None:
+        largo, ancho, self.altura = dimensiones_contenedor
+        self.alturas = np.zeros((largo, ancho), dtype=_tipo_entero(self.altura))
+
+    def primera_posicion(self, dimensiones: tuple, paso_rejilla: int = 1):
+        """Primera base factible en el orden de la rejilla (x, luego y) con z redondeada al paso, o None"""
+        l, a, h = dimensiones
+        largo, ancho = self.alturas.shape
+        if l > largo or a > ancho or h > self.altura:
+            return None
+        for inicio, fin in _bloques_anclas(largo - l + 1, paso_rejilla):
+            bloque = _ventana(self.alturas[inicio:fin - 1 + l], l, np.maximum)[::paso_rejilla]
+            bases = _ventana(bloque.T, a, np.maximum).T[:, ::paso_rejilla].astype(np.int64)
+            bases = -(-bases // paso_rejilla) * paso_rejilla
+            factibles = bases + h <= self.altura
+            if factibles.any():
+                i, j = np.unravel_index(np.argmax(factibles), factibles.shape)
+                return inicio + int(i) * paso_rejilla, int(j) * paso_rejilla, int(bases[i, j])
+        return None
+
+    def ocupar(self, posicion: tuple, dimensiones: tuple) -> None:
+        (x, y, z), (l, a, h) = posicion, dimensiones
+        base = self.alturas[x:x + l, y:y + a]
+        np.maximum(base, z + h, out=base)
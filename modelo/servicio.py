@@ -0,0 +1,261 @@
+"""
+    Servicio local de optimización sobre asyncio: los trabajos llegan con
+    los mismos datos que Control.solicitud, esperan en una cola con
+    prioridades de profundidad limitada y se ejecutan en un grupo acotado
+    de procesos. Se puede consultar el estado y el avance de cada trabajo,
+    esperar su resultado y cancelarlo:
+
+        async with ServicioOptimizacion(procesos=4, profundidad_cola=100) as servicio:
+            id_trabajo = await servicio.enviar(contenedores, paquetes, rotaciones, 200, 30, prioridad=1)
+            resultado = await servicio.resultado(id_trabajo)
+"""
+import asyncio
+import itertools
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+from modelo.datos import RequisitosContenedor, Paquete
+from modelo.trabajos import ejecutar_trabajo
+
+ESTADOS = ('en_cola', 'ejecutando', 'terminado', 'cancelado', 'fallido')
+
+# Estado compartido dentro de cada proceso del grupo
+_avisos = None
+_cancelados = None
+
+
+def _inicializar_proceso(avisos, cancelados) -> None:
+    global _avisos, _cancelados
+    _avisos = avisos
+    _cancelados = cancelados
+
+
+def _ejecutar_en_proceso(id_trabajo: int, trabajo: dict) -> dict:
+    """Ejecuta el trabajo, envía el avance de cada generación y se detiene si se pidió cancelarlo"""
+    def progreso(registro: dict) -> bool:
+        _avisos.put((id_trabajo, {
+            'gen': registro['gen'],
+            'mejor_aptitud': float(registro['mejor_aptitud']),
+            'evaluaciones': registro['evaluaciones'],
+            'evaluaciones_por_segundo': registro['evaluaciones_por_segundo'],
+        }))
+        return id_trabajo in _cancelados
+    return ejecutar_trabajo(trabajo, progreso)
+
+
+@dataclass
+class TrabajoServicio:
+    id: int
+    prioridad: int
+    trabajo: dict
+    terminado: asyncio.Future
+    estado: str = 'en_cola'
+    progreso: dict = None
+    resultado: dict = None
+    error: str = None
+    cancelacion_solicitada: bool = False
+    tiempos: dict = field(default_factory=dict)
+
+    def resumen(self) -> dict:
+        """Copia del estado apta para devolver a quien consulta el servicio"""
+        return {
+            'id': self.id,
+            'prioridad': self.prioridad,
+            'estado': self.estado,
+            'generaciones': self.trabajo['parametros']['generaciones'],
+            'progreso': None if self.progreso is None else dict(self.progreso),
+            'error': self.error,
+            **self.tiempos,
+        }
+
+
+class ServicioOptimizacion:
+    """
+    Cola de trabajos con prioridad (menor valor se atiende antes; a igual prioridad,
+    por orden de llegada) atendida por procesos trabajadores. progreso, si se indica,
+    se llama en el bucle de eventos con (id_trabajo, avance) en cada generación
+    """
+
+    def __init__(self, procesos: int = 1, profundidad_cola: int = 0, progreso=None) -> None:
+        if procesos < 1:
+            raise ValueError("procesos debe ser al menos 1")
+        self.procesos = procesos
+        # 0: cola sin límite, como en asyncio.Queue
+        self.profundidad_cola = profundidad_cola
+        self.progreso = progreso
+        self._trabajos: dict[int, TrabajoServicio] = {}
+        self._ids = itertools.count(1)
+        self._llegadas = itertools.count()
+        self._cola = None
+        # Plazas de la cola: solo cuentan los trabajos que siguen en_cola, no los cancelados
+        self._plazas = None
+        self._grupo = None
+        self._gestor = None
+        self._cancelados = None
+        self._avisos = None
+        self._tareas = []
+        self._lector = None
+        self._cerrado = True
+
+    async def iniciar(self) -> None:
+        contexto = multiprocessing.get_context()
+        self._gestor = contexto.Manager()
+        self._cancelados = self._gestor.dict()
+        self._avisos = contexto.Queue()
+        self._grupo = ProcessPoolExecutor(self.procesos, mp_context=contexto, initializer=_inicializar_proceso,
+                                          initargs=(self._avisos, self._cancelados))
+        self._cola = asyncio.PriorityQueue()
+        self._plazas = asyncio.Semaphore(self.profundidad_cola) if self.profundidad_cola > 0 else None
+        self._tareas = [asyncio.create_task(self._atender()) for _ in range(self.procesos)]
+        # Hilo daemon: si el servicio no se cierra no retiene la salida del intérprete
+        self._lector = threading.Thread(target=self._leer_avisos, args=(asyncio.get_running_loop(),), daemon=True)
+        self._lector.start()
+        self._cerrado = False
+
+    async def cerrar(self, cancelar_pendientes: bool = False) -> None:
+        """Deja de aceptar trabajos, espera (o cancela) los pendientes y libera los procesos"""
+        if self._cerrado:
+            return
+        self._cerrado = True
+        if cancelar_pendientes:
+            for id_trabajo, trabajo in self._trabajos.items():
+                if trabajo.estado in ('en_cola', 'ejecutando'):
+                    self.cancelar(id_trabajo)
+        await self._cola.join()
+        for tarea in self._tareas:
+            tarea.cancel()
+        await asyncio.gather(*self._tareas, return_exceptions=True)
+
+        bucle = asyncio.get_running_loop()
+        await bucle.run_in_executor(None, self._grupo.shutdown)
+        # None termina la lectura de avisos cuando ya llegaron los de todos los trabajos
+        self._avisos.put(None)
+        await bucle.run_in_executor(None, self._lector.join)
+        self._avisos.close()
+        self._gestor.shutdown()
+
+    async def __aenter__(self):
+        await self.iniciar()
+        return self
+
+    async def __aexit__(self, *excepcion) -> None:
+        await self.cerrar(cancelar_pendientes=excepcion[0] is not None)
+
+    async def enviar(self, contenedores: list[RequisitosContenedor], paquetes: list[Paquete], rotaciones: list[tuple],
+                     poblacion: int, generaciones: int, prioridad: int = 0, semilla=None,
+                     parametros: dict = None, esperar: bool = True) -> int:
+        """
+        Encola un trabajo y devuelve su id. parametros añade argumentos del optimizador.
+        Con la cola llena espera a que haya sitio, o lanza asyncio.QueueFull si esperar es False
+        """
+        if self._cerrado:
+            raise RuntimeError("El servicio no está aceptando trabajos")
+        if self._plazas is not None:
+            if not esperar and self._plazas.locked():
+                raise asyncio.QueueFull
+            await self._plazas.acquire()
+            if self._cerrado:
+                self._plazas.release()
+                raise RuntimeError("El servicio no está aceptando trabajos")
+        trabajo = TrabajoServicio(
+            id=next(self._ids),
+            prioridad=prioridad,
+            trabajo={
+                'contenedores': contenedores,
+                'paquetes': paquetes,
+                'rotaciones': rotaciones,
+                'parametros': {**(parametros or {}), 'tamano_poblacion': poblacion,
+                               'generaciones': generaciones, 'semilla': semilla},
+            },
+            terminado=asyncio.get_running_loop().create_future()
+        )
+        # Registrado antes de encolarlo: un trabajador puede sacarlo en cuanto entra en la cola
+        trabajo.tiempos['encolado'] = time.time()
+        self._trabajos[trabajo.id] = trabajo
+        self._cola.put_nowait((prioridad, next(self._llegadas), trabajo.id))
+        return trabajo.id
+
+    def estado(self, id_trabajo: int) -> dict:
+        return self._buscar(id_trabajo).resumen()
+
+    def estados(self) -> list[dict]:
+        return [trabajo.resumen() for trabajo in self._trabajos.values()]
+
+    async def resultado(self, id_trabajo: int) -> dict:
+        """
+        Espera a que el trabajo termine y devuelve su resultado (el de ejecutar_trabajo).
+        Un trabajo cancelado devuelve la mejor solución hasta la cancelación, o None si no llegó
+        a empezar; uno fallido lanza RuntimeError con el error
+        """
+        trabajo = self._buscar(id_trabajo)
+        await asyncio.shield(trabajo.terminado)
+        if trabajo.estado == 'fallido':
+            raise RuntimeError(f"Falló el trabajo {id_trabajo}: {trabajo.error}")
+        return trabajo.resultado
+
+    def cancelar(self, id_trabajo: int) -> bool:
+        """Cancela un trabajo en cola o en ejecución (termina en la generación en curso)"""
+        trabajo = self._buscar(id_trabajo)
+        if trabajo.estado == 'en_cola':
+            # La entrada sigue en la cola y se descarta al salir de ella, pero libera ya su plaza
+            self._liberar_plaza()
+            self._finalizar(trabajo, 'cancelado')
+            return True
+        if trabajo.estado == 'ejecutando':
+            trabajo.cancelacion_solicitada = True
+            self._cancelados[id_trabajo] = True
+            return True
+        return False
+
+    def _buscar(self, id_trabajo: int) -> TrabajoServicio:
+        try:
+            return self._trabajos[id_trabajo]
+        except KeyError:
+            raise KeyError(f"Trabajo desconocido: {id_trabajo}") from None
+
+    def _liberar_plaza(self) -> None:
+        if self._plazas is not None:
+            self._plazas.release()
+
+    def _finalizar(self, trabajo: TrabajoServicio, estado: str) -> None:
+        trabajo.estado = estado
+        trabajo.tiempos['fin'] = time.time()
+        trabajo.terminado.set_result(None)
+
+    async def _atender(self) -> None:
+        """Saca trabajos de la cola y los ejecuta; hay una tarea por proceso del grupo"""
+        bucle = asyncio.get_running_loop()
+        while True:
+            _, _, id_trabajo = await self._cola.get()
+            trabajo = self._trabajos[id_trabajo]
+            try:
+                if trabajo.estado != 'en_cola':
+                    continue
+                self._liberar_plaza()
+                trabajo.estado = 'ejecutando'
+                trabajo.tiempos['inicio'] = time.time()
+                try:
+                    trabajo.resultado = await bucle.run_in_executor(
+                        self._grupo, _ejecutar_en_proceso, id_trabajo, trabajo.trabajo)
+                except Exception as error:
+                    trabajo.error = f"{type(error).__name__}: {error}"
+                    self._finalizar(trabajo, 'fallido')
+                else:
+                    self._finalizar(trabajo, 'cancelado' if trabajo.cancelacion_solicitada else 'terminado')
+                finally:
+                    self._cancelados.pop(id_trabajo, None)
+            finally:
+                self._cola.task_done()
+
+    def _leer_avisos(self, bucle) -> None:
+        """Recoge en su hilo el avance que envían los procesos y lo pasa al bucle de eventos"""
+        while (aviso := self._avisos.get()) is not None:
+            bucle.call_soon_threadsafe(self._aplicar_aviso, *aviso)
+
+    def _aplicar_aviso(self, id_trabajo: int, avance: dict) -> None:
+        self._trabajos[id_trabajo].progreso = avance
+        if self.progreso is not None:
+            self.progreso(id_trabajo, avance)
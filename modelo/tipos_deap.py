@@ -0,0 +1,44 @@
+"""
+    Tipos de aptitud e individuo para DEAP definidos a nivel de módulo:
+    sustituyen a creator.create, que registra las clases como estado
+    global y hace que dos optimizadores del mismo proceso se pisen.
+    Al estar en un módulo se serializan por referencia con pickle
+"""
+import array
+import copy
+
+from deap import base
+
+
+class Aptitud(base.Fitness):
+    """Aptitud de un solo objetivo a maximizar"""
+    weights = (1.0,)
+
+
+class Individuo(list):
+    """Individuo sobre list: los genes y su aptitud"""
+
+    def __init__(self, genes=()):
+        super().__init__(genes)
+        self.fitness = Aptitud()
+
+
+class IndividuoCompacto(array.array):
+    """Individuo sobre array('i') para la representación compacta"""
+    typecode = 'i'
+
+    def __new__(cls, genes=()):
+        return super().__new__(cls, cls.typecode, genes)
+
+    def __init__(self, genes=()):
+        self.fitness = Aptitud()
+
+    def __deepcopy__(self, memo):
+        # array.array no copia los atributos ni conserva la subclase
+        copia = self.__class__.__new__(self.__class__, self)
+        memo[id(self)] = copia
+        copia.__dict__.update(copy.deepcopy(self.__dict__, memo))
+        return copia
+
+    def __reduce__(self):
+        return self.__class__, (list(self),), self.__dict__
@@ -0,0 +1,162 @@
+"""
+    Trabajos por lotes: lectura de archivos de trabajo JSON o CSV con
+    contenedores, paquetes, rotaciones y parámetros del algoritmo, y
+    ejecución del optimizador sin interfaz gráfica
+"""
+import csv
+import io
+import json
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+
+import numpy as np
+
+from modelo.datos import RequisitosContenedor, Paquete
+from modelo.bpga_3d import OptimizadorEmpaquetadoMultiContenedor3D
+from modelo.bpga_2d import OptimizadorEmpaquetadoMultiContenedor2D
+from modelo.bpga_1d import OptimizadorEmpaquetadoMultiContenedor1D
+
+# Optimizador según el número de ejes de los contenedores
+OPTIMIZADORES = {
+    1: OptimizadorEmpaquetadoMultiContenedor1D,
+    2: OptimizadorEmpaquetadoMultiContenedor2D,
+    3: OptimizadorEmpaquetadoMultiContenedor3D,
+}
+
+EXTENSIONES_TRABAJO = ('.json', '.csv')
+
+# Sin permisos de rotación se usan estos (el 2D solo mira el primero)
+SIN_ROTACIONES = (False,) * 5
+
+
+def leer_trabajo(ruta) -> dict:
+    """Lee un archivo de trabajo y devuelve contenedores, paquetes, rotaciones y parámetros"""
+    ruta = Path(ruta)
+    if ruta.suffix.lower() == '.json':
+        with open(ruta, encoding='utf-8') as archivo:
+            return _trabajo_desde_json(json.load(archivo))
+    if ruta.suffix.lower() == '.csv':
+        with open(ruta, encoding='utf-8', newline='') as archivo:
+            return _trabajo_desde_csv(csv.DictReader(archivo))
+    raise ValueError(f"Formato de trabajo desconocido: {ruta.suffix}")
+
+
+def _trabajo_desde_json(datos: dict) -> dict:
+    """
+    Formato JSON:
+    {"contenedores": [{"id": "C1", "dimensiones": [10, 10, 10], "uso_opcional": false}],
+     "paquetes": [{"nombre": "P1", "dimensiones": [3, 3, 3], "cantidad_minima": 1,
+                   "cantidad_maxima": 5, "rotaciones": [true, true, true, true, true]}],
+     "parametros": {"tamano_poblacion": 200, "generaciones": 30, "semilla": 1}}
+    """
+    contenedores = [
+        RequisitosContenedor(tuple(c['dimensiones']), c['id'], c.get('uso_opcional', False))
+        for c in datos['contenedores']
+    ]
+    paquetes = [
+        Paquete(p['nombre'], tuple(p['dimensiones']), p['cantidad_minima'], p['cantidad_maxima'])
+        for p in datos['paquetes']
+    ]
+    rotaciones = [tuple(p.get('rotaciones', SIN_ROTACIONES)) for p in datos['paquetes']]
+    return {
+        'contenedores': contenedores,
+        'paquetes': paquetes,
+        'rotaciones': rotaciones,
+        'parametros': dict(datos.get('parametros', {}))
+    }
+
+
+def _trabajo_desde_csv(filas) -> dict:
+    """
+    Formato CSV, una fila por elemento con las columnas
+    elemento,nombre,dimensiones,cantidad_minima,cantidad_maxima,uso_opcional,rotaciones,valor
+    donde elemento es contenedor, paquete o parametro, las dimensiones van
+    separadas por 'x' (10x10x10) y las rotaciones son una cadena de 0 y 1
+    """
+    contenedores, paquetes, rotaciones, parametros = [], [], [], {}
+    for numero, fila in enumerate(filas, start=2):
+        elemento = fila['elemento'].strip().lower()
+        if elemento == 'contenedor':
+            contenedores.append(RequisitosContenedor(
+                _dimensiones_csv(fila['dimensiones']), fila['nombre'], fila.get('uso_opcional') == '1'
+            ))
+        elif elemento == 'paquete':
+            paquetes.append(Paquete(
+                fila['nombre'], _dimensiones_csv(fila['dimensiones']),
+                int(fila['cantidad_minima']), int(fila['cantidad_maxima'])
+            ))
+            permisos = (fila.get('rotaciones') or '').strip()
+            rotaciones.append(tuple(c == '1' for c in permisos) if permisos else SIN_ROTACIONES)
+        elif elemento == 'parametro':
+            parametros[fila['nombre']] = _valor_csv(fila['valor'])
+        else:
+            raise ValueError(f"Elemento desconocido en la fila {numero}: {fila['elemento']}")
+    return {
+        'contenedores': contenedores,
+        'paquetes': paquetes,
+        'rotaciones': rotaciones,
+        'parametros': parametros
+    }
+
+
+def _dimensiones_csv(texto: str) -> tuple:
+    return tuple(int(d) for d in texto.lower().split('x'))
+
+
+def _valor_csv(texto: str):
+    """Números y booleanos se leen como JSON; el resto se deja como texto"""
+    try:
+        return json.loads(texto)
+    except json.JSONDecodeError:
+        return texto
+
+
+def crear_optimizador(trabajo: dict):
+    """Construye el optimizador 1D, 2D o 3D que corresponde a los contenedores del trabajo"""
+    parametros = {k: v for k, v in trabajo['parametros'].items() if k != 'semilla'}
+    ejes = len(trabajo['contenedores'][0].dimensiones)
+    if ejes not in OPTIMIZADORES:
+        raise ValueError(f"Los contenedores deben tener 1, 2 o 3 dimensiones, no {ejes}")
+    return OPTIMIZADORES[ejes](
+        requisitos_contenedores=trabajo['contenedores'],
+        tipos_paquetes=trabajo['paquetes'],
+        rotaciones_permitidas=trabajo['rotaciones'],
+        **parametros
+    )
+
+
+def ejecutar_trabajo(trabajo: dict, progreso=None) -> dict:
+    """
+    Ejecuta la optimización de un trabajo y devuelve un resultado serializable
+    junto con el texto que el optimizador imprime durante la ejecución.
+    progreso se pasa a optimizar: recibe cada generación y puede detenerla
+    """
+    inicio = time.perf_counter()
+    salida = io.StringIO()
+    with redirect_stdout(salida):
+        optimizador = crear_optimizador(trabajo)
+        resultado = optimizador.optimizar(semilla=trabajo['parametros'].get('semilla'), progreso=progreso)
+        # Sin ningún individuo con aptitud positiva (nada cabe, o se detuvo antes) no hay solución que analizar
+        hay_solucion = resultado['individuo'] is not None
+        analisis = optimizador.analizar_resultados(resultado) if hay_solucion else None
+    return {
+        'aptitud': resultado['aptitud'],
+        'individuo': list(resultado['individuo']) if hay_solucion else None,
+        'posiciones': resultado['posiciones'],
+        'analisis': analisis,
+        'estadisticas': list(optimizador.logbook),
+        'segundos': time.perf_counter() - inicio,
+        'registro': salida.getvalue()
+    }
+
+
+def convertir_json(valor):
+    """Función default de json.dump para los tipos de NumPy del resultado"""
+    if isinstance(valor, np.integer):
+        return int(valor)
+    if isinstance(valor, np.floating):
+        return float(valor)
+    if isinstance(valor, (np.ndarray, np.bool_)):
+        return valor.tolist()
+    raise TypeError(f"Tipo no serializable: {type(valor).__name__}")
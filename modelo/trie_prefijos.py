@@ -0,0 +1,98 @@
+"""
+    Trie de prefijos de cantidades para la colocación incremental:
+    cada nodo guarda el estado del contenedor después de colocar los
+    tipos de paquete del prefijo, para continuar desde ahí
+"""
+import copy
+
+import numpy as np
+
+# Bytes aproximados de una tupla de paquete colocado o de un elemento de las listas del estado
+BYTES_ELEMENTO = 64
+
+
+def bytes_nodo(paquetes_colocados: tuple, estado) -> int:
+    """
+    Memoria aproximada de un nodo: las matrices de NumPy del estado por su tamaño
+    real y las tuplas, listas y diccionarios por número de elementos
+    """
+    total = BYTES_ELEMENTO * (len(paquetes_colocados) + 1)
+    pendientes = [] if estado is None else [estado]
+    while pendientes:
+        valor = pendientes.pop()
+        if isinstance(valor, np.ndarray):
+            total += valor.nbytes
+        elif isinstance(valor, (list, tuple, dict)):
+            total += BYTES_ELEMENTO * len(valor)
+        elif hasattr(valor, '__dict__'):
+            pendientes.extend(vars(valor).values())
+    return total
+
+
+class NodoPrefijo:
+    """Estado del contenedor tras colocar las cantidades del camino hasta el nodo"""
+    __slots__ = ('hijos', 'paquetes_colocados', 'estado')
+
+    def __init__(self, paquetes_colocados: tuple, estado) -> None:
+        self.hijos = {}
+        self.paquetes_colocados = paquetes_colocados
+        self.estado = estado
+
+    def restaurar(self) -> tuple[list, object]:
+        """Copia de trabajo de los paquetes colocados y del estado del motor"""
+        return list(self.paquetes_colocados), copy.deepcopy(self.estado)
+
+
+class TriePrefijos:
+    """
+    Un trie por dimensiones de contenedor con los estados de colocación por prefijo.
+    Al superar max_nodos, o peso_maximo medido con la función peso sobre los
+    paquetes y el estado de cada nodo, se vacía por completo para acotar la memoria
+    """
+
+    def __init__(self, max_nodos: int, peso_maximo: int = None, peso=None) -> None:
+        self.max_nodos = max_nodos
+        self.peso_maximo = peso_maximo
+        self.peso = peso
+        self.peso_total = 0
+        self.num_nodos = 0
+        self.raices = {}
+
+    def _sumar(self, paquetes_colocados: tuple, estado) -> None:
+        self.num_nodos += 1
+        if self.peso is not None:
+            self.peso_total += self.peso(paquetes_colocados, estado)
+
+    def prefijo_mas_largo(self, dimensiones_contenedor: tuple, conteos, crear_estado) -> tuple[NodoPrefijo, int]:
+        """Devuelve el nodo del prefijo guardado más largo de conteos y su longitud"""
+        if self.num_nodos >= self.max_nodos or (self.peso_maximo is not None and self.peso_total > self.peso_maximo):
+            self.raices.clear()
+            self.num_nodos = 0
+            self.peso_total = 0
+
+        nodo = self.raices.get(dimensiones_contenedor)
+        if nodo is None:
+            nodo = NodoPrefijo((), crear_estado(dimensiones_contenedor))
+            self.raices[dimensiones_contenedor] = nodo
+            self._sumar(nodo.paquetes_colocados, nodo.estado)
+
+        profundidad = 0
+        for cantidad in conteos:
+            hijo = nodo.hijos.get(cantidad)
+            if hijo is None:
+                break
+            nodo = hijo
+            profundidad += 1
+        return nodo, profundidad
+
+    def agregar(self, padre: NodoPrefijo, cantidad: int, paquetes_colocados: list, estado) -> NodoPrefijo:
+        """Guarda una copia del estado tras colocar cantidad paquetes del siguiente tipo"""
+        if len(paquetes_colocados) == len(padre.paquetes_colocados):
+            # No se colocó nada: el estado es el mismo que el del padre y no ocupa memoria nueva
+            hijo = NodoPrefijo(padre.paquetes_colocados, padre.estado)
+            self.num_nodos += 1
+        else:
+            hijo = NodoPrefijo(tuple(paquetes_colocados), copy.deepcopy(estado))
+            self._sumar(hijo.paquetes_colocados, hijo.estado)
+        padre.hijos[cantidad] = hijo
+        return hijo
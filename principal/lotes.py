@@ -0,0 +1,91 @@
+"""
+    Ejecución por lotes sin interfaz gráfica:
+
+        python -m principal.lotes trabajos/ otro_trabajo.json --salida resultados --procesos 8
+
+    Cada archivo de trabajo (JSON o CSV, ver modelo/trabajos.py) produce en la
+    carpeta de salida un <nombre>.json con el resultado y un <nombre>.log con lo
+    que imprimió el optimizador; resumen.json reúne la aptitud de todos
+"""
+import argparse
+import json
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from modelo.trabajos import EXTENSIONES_TRABAJO, leer_trabajo, ejecutar_trabajo, convertir_json
+
+
+def buscar_trabajos(entradas: list[str]) -> list[Path]:
+    """Archivos de trabajo indicados directamente o contenidos en las carpetas dadas"""
+    rutas = []
+    for entrada in map(Path, entradas):
+        if entrada.is_dir():
+            rutas.extend(sorted(r for r in entrada.iterdir() if r.suffix.lower() in EXTENSIONES_TRABAJO))
+        else:
+            rutas.append(entrada)
+    return rutas
+
+
+def procesar_trabajo(ruta: Path, carpeta_salida: Path) -> dict:
+    """Ejecuta un trabajo, escribe su resultado y devuelve la línea del resumen"""
+    resumen = {'trabajo': str(ruta), 'aptitud': None, 'segundos': None, 'error': None}
+    try:
+        resultado = ejecutar_trabajo(leer_trabajo(ruta))
+    except Exception as error:
+        resumen['error'] = f"{type(error).__name__}: {error}"
+        resultado = {'error': resumen['error']}
+    else:
+        resumen['aptitud'] = resultado['aptitud']
+        resumen['segundos'] = resultado['segundos']
+        (carpeta_salida / f"{ruta.stem}.log").write_text(resultado.pop('registro'), encoding='utf-8')
+
+    with open(carpeta_salida / f"{ruta.stem}.json", 'w', encoding='utf-8') as archivo:
+        json.dump({'trabajo': str(ruta), **resultado}, archivo, ensure_ascii=False, indent=2,
+                  default=convertir_json)
+    return resumen
+
+
+def main(argumentos: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Optimiza por lotes archivos de trabajo de empaquetado")
+    parser.add_argument('entradas', nargs='+', help="Archivos de trabajo .json/.csv o carpetas que los contienen")
+    parser.add_argument('--salida', default='resultados', help="Carpeta donde se escriben los resultados")
+    parser.add_argument('--procesos', type=int, default=1, help="Trabajos que se ejecutan a la vez")
+    args = parser.parse_args(argumentos)
+
+    rutas = buscar_trabajos(args.entradas)
+    nombres = [r.stem for r in rutas]
+    repetidos = {n for n in nombres if nombres.count(n) > 1}
+    if repetidos:
+        parser.error(f"Varios trabajos escribirían el mismo resultado: {', '.join(sorted(repetidos))}")
+    carpeta_salida = Path(args.salida)
+    carpeta_salida.mkdir(parents=True, exist_ok=True)
+
+    resumenes = []
+    if args.procesos <= 1:
+        for ruta in rutas:
+            resumenes.append(procesar_trabajo(ruta, carpeta_salida))
+            _mostrar(resumenes[-1])
+    else:
+        # Los procesos de ProcessPoolExecutor no son daemon: cada trabajo puede usar sus propios trabajadores
+        with ProcessPoolExecutor(args.procesos) as grupo:
+            futuros = [grupo.submit(procesar_trabajo, ruta, carpeta_salida) for ruta in rutas]
+            for futuro in as_completed(futuros):
+                resumenes.append(futuro.result())
+                _mostrar(resumenes[-1])
+
+    resumenes.sort(key=lambda r: r['trabajo'])
+    with open(carpeta_salida / 'resumen.json', 'w', encoding='utf-8') as archivo:
+        json.dump(resumenes, archivo, ensure_ascii=False, indent=2, default=convertir_json)
+    return 1 if any(r['error'] for r in resumenes) else 0
+
+
+def _mostrar(resumen: dict) -> None:
+    if resumen['error']:
+        print(f"{resumen['trabajo']}: error {resumen['error']}")
+    else:
+        print(f"{resumen['trabajo']}: aptitud {resumen['aptitud']:.6f} en {resumen['segundos']:.1f} s")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
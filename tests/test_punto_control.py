@@ -0,0 +1,52 @@
+import io
+from contextlib import redirect_stdout
+
+from modelo.datos import RequisitosContenedor, Paquete
+from modelo.bpga_2d import OptimizadorEmpaquetadoMultiContenedor2D
+
+COLUMNAS = ('gen', 'desviación', 'mínimo', 'promedio', 'máximo')
+
+
+def crear_optimizador(generaciones: int = 12):
+    contenedores = [RequisitosContenedor((12, 10), 'C1'), RequisitosContenedor((10, 8), 'C2', True)]
+    paquetes = [Paquete('P1', (2, 3), 1, 8), Paquete('P2', (4, 2), 1, 6), Paquete('P3', (3, 5), 0, 4)]
+    # prob_mutacion distinta de la que fija _mutar: la reanudación debe restaurar la vigente
+    return OptimizadorEmpaquetadoMultiContenedor2D(contenedores, paquetes, [(True,)] * 3, tamano_poblacion=40,
+                                                   generaciones=generaciones, prob_mutacion=0.3)
+
+
+def estadisticas(logbook) -> list:
+    return [tuple(fila[columna] for columna in COLUMNAS) for fila in logbook]
+
+
+def test_reanudar_reproduce_la_ejecucion_sin_interrupcion(tmp_path):
+    ruta = str(tmp_path / 'punto_control.gz')
+    with redirect_stdout(io.StringIO()):
+        continua = crear_optimizador()
+        resultado_continuo = continua.optimizar(semilla=7, ruta_punto_control=str(tmp_path / 'otro.gz'),
+                                                intervalo_punto_control=3)
+
+        # Se interrumpe en la generación 4; el último punto de control es el de la generación 2
+        interrumpida = crear_optimizador()
+        interrumpida.optimizar(semilla=7, progreso=lambda registro: registro['gen'] == 4,
+                               ruta_punto_control=ruta, intervalo_punto_control=3)
+
+        reanudada = crear_optimizador()
+        resultado_reanudado = reanudada.reanudar(ruta, intervalo_punto_control=3)
+
+    assert estadisticas(reanudada.logbook) == estadisticas(continua.logbook)
+    assert resultado_reanudado['aptitud'] == resultado_continuo['aptitud']
+    assert list(resultado_reanudado['individuo']) == list(resultado_continuo['individuo'])
+
+
+def test_reanudar_desde_la_ultima_generacion_conserva_el_mejor_individuo(tmp_path):
+    # Con 6 generaciones e intervalo 3 el último punto de control es el de la generación final
+    ruta = str(tmp_path / 'punto_control.gz')
+    with redirect_stdout(io.StringIO()):
+        resultado = crear_optimizador(generaciones=6).optimizar(semilla=7, ruta_punto_control=ruta,
+                                                                intervalo_punto_control=3)
+        resultado_reanudado = crear_optimizador(generaciones=6).reanudar(ruta, intervalo_punto_control=3)
+
+    assert resultado_reanudado['aptitud'] == resultado['aptitud'] > 0
+    assert list(resultado_reanudado['individuo']) == list(resultado['individuo'])
+    assert resultado_reanudado['posiciones'] == resultado['posiciones']
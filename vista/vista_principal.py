@@ -1,6 +1,6 @@
 from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QTabWidget,
                              QPushButton, QHBoxLayout, QLabel, QTableWidget, QTableWidgetItem,
-                             QCheckBox, QSpinBox, QFrame)
+                             QCheckBox, QSpinBox, QFrame, QProgressBar)
 from modelo.datos import RequisitosContenedor, Paquete
 
 
@@ -250,6 +250,23 @@ class BPGAVista(QMainWindow):
 
         layout_principal.addWidget(self.widget_pestanas)
 
+        # Avance del trabajo en curso y trabajos en cola
+        frame_progreso = ModernFrame()
+        layout_progreso = QVBoxLayout()
+        layout_progreso.setContentsMargins(0, 0, 0, 0)
+        layout_progreso.setSpacing(4)
+        frame_progreso.setLayout(layout_progreso)
+
+        self.etiqueta_progreso = QLabel("Sin trabajos en curso")
+        self.barra_progreso = QProgressBar()
+        self.barra_progreso.setRange(0, 100)
+        self.barra_progreso.setValue(0)
+        layout_progreso.addWidget(self.etiqueta_progreso)
+        layout_progreso.addWidget(self.barra_progreso)
+        self.generaciones_trabajo = {}
+
+        layout_principal.addWidget(frame_progreso)
+
         # Botones de acción
         frame_botones = ModernFrame()
         layout_botones = QHBoxLayout()
@@ -297,6 +314,41 @@ class BPGAVista(QMainWindow):
         pestana_actual = self.pestanas[self.widget_pestanas.tabText(self.widget_pestanas.currentIndex())]
         pestana_actual.limpiar_entradas()
 
+    def trabajo_encolado(self, id_trabajo: int, generaciones: int, pendientes: int):
+        self.generaciones_trabajo[id_trabajo] = generaciones
+        if pendientes > 1:
+            self.etiqueta_progreso.setText(f"Trabajo {id_trabajo} en cola ({pendientes} pendientes)")
+        else:
+            self.etiqueta_progreso.setText(f"Trabajo {id_trabajo} iniciado")
+            self.barra_progreso.setValue(0)
+
+    def mostrar_progreso(self, id_trabajo: int, registro: dict, pendientes: int):
+        generaciones = self.generaciones_trabajo[id_trabajo]
+        generacion = registro['gen'] + 1
+        self.barra_progreso.setValue(int(100 * generacion / generaciones))
+        self.etiqueta_progreso.setText(
+            f"Trabajo {id_trabajo}: generación {generacion}/{generaciones}, "
+            f"mejor aptitud {registro['mejor_aptitud']:.6f}, "
+            f"{registro['evaluaciones_por_segundo']:.0f} evaluaciones/s"
+            + (f" ({pendientes - 1} en cola)" if pendientes > 1 else "")
+        )
+
+    def trabajo_terminado(self, id_trabajo: int, aptitud: float, pendientes: int):
+        self.generaciones_trabajo.pop(id_trabajo, None)
+        self.barra_progreso.setValue(100 if not pendientes else 0)
+        self.etiqueta_progreso.setText(
+            f"Trabajo {id_trabajo} terminado con aptitud {aptitud:.6f}"
+            + (f" ({pendientes} en cola)" if pendientes else "")
+        )
+
+    def trabajo_fallido(self, id_trabajo: int, mensaje: str, pendientes: int):
+        self.generaciones_trabajo.pop(id_trabajo, None)
+        self.barra_progreso.setValue(0)
+        self.etiqueta_progreso.setText(
+            f"Trabajo {id_trabajo} falló: {mensaje}"
+            + (f" ({pendientes} en cola)" if pendientes else "")
+        )
+
 
 class PestanaPaquete(QWidget):
     def __init__(self, dimensiones):